@@ -11,6 +11,8 @@ from pathlib import Path
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from sqlalchemy import func, select
+
 from src.database import Database
 from src.database.models import Transaccion
 
@@ -36,7 +38,7 @@ def limpiar_base_datos():
     try:
         with db.get_session() as session:
             # Contar antes de eliminar
-            total_transacciones = session.query(Transaccion).count()
+            total_transacciones = session.scalar(select(func.count()).select_from(Transaccion))
 
             print(f"\n📊 Registros a eliminar:")
             print(f"  - Transacciones: {total_transacciones}")
@@ -86,7 +88,7 @@ def limpiar_todo():
 
     try:
         with db.get_session() as session:
-            total_transacciones = session.query(Transaccion).count()
+            total_transacciones = session.scalar(select(func.count()).select_from(Transaccion))
 
             print(f"\n📊 Eliminando de base de datos:")
             print(f"  - Transacciones: {total_transacciones}")
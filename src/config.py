@@ -3,12 +3,12 @@ Configuración global de FacturIA 2.0
 Carga variables de entorno y configuraciones del sistema
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
-# Cargar variables de entorno
-load_dotenv()
-
 # === PATHS DEL PROYECTO ===
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -18,17 +18,55 @@ INGRESOS_DIR = DATA_DIR / "ingresos"
 EGRESOS_DIR = DATA_DIR / "egresos"
 PROCESADOS_DIR = DATA_DIR / "procesados"
 
+
+# === VARIABLES DE ENTORNO ===
+@dataclass(frozen=True)
+class Configuracion:
+    """Valores leídos del entorno (.env), resueltos una sola vez"""
+    GOOGLE_API_KEY: Optional[str]
+    GMAIL_EMAIL: Optional[str]
+    GMAIL_PASSWORD: Optional[str]
+    DATABASE_URL: str
+    EMAIL_CHECK_INTERVAL: int  # minutos
+    ENVIRONMENT: str
+
+
+@lru_cache(maxsize=None)
+def get_config() -> Configuracion:
+    """
+    Carga el .env y parsea las variables de entorno
+
+    El resultado se cachea: todos los módulos que lo piden comparten
+    la misma instancia y el .env se lee una única vez por proceso.
+
+    Returns:
+        Configuracion inmutable
+    """
+    load_dotenv()
+
+    return Configuracion(
+        GOOGLE_API_KEY=os.getenv("GOOGLE_API_KEY"),
+        GMAIL_EMAIL=os.getenv("GMAIL_EMAIL"),
+        GMAIL_PASSWORD=os.getenv("GMAIL_PASSWORD"),
+        DATABASE_URL=os.getenv("DATABASE_URL", "sqlite:///facturia2.db"),
+        EMAIL_CHECK_INTERVAL=int(os.getenv("EMAIL_CHECK_INTERVAL", "5")),
+        ENVIRONMENT=os.getenv("ENVIRONMENT", "development")
+    )
+
+
+_config = get_config()
+
 # === CREDENCIALES ===
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GMAIL_EMAIL = os.getenv("GMAIL_EMAIL")
-GMAIL_PASSWORD = os.getenv("GMAIL_PASSWORD")
+GOOGLE_API_KEY = _config.GOOGLE_API_KEY
+GMAIL_EMAIL = _config.GMAIL_EMAIL
+GMAIL_PASSWORD = _config.GMAIL_PASSWORD
 
 # === BASE DE DATOS ===
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///facturia2.db")
+DATABASE_URL = _config.DATABASE_URL
 
 # === CONFIGURACIÓN DEL SISTEMA ===
-EMAIL_CHECK_INTERVAL = int(os.getenv("EMAIL_CHECK_INTERVAL", "5"))  # minutos
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+EMAIL_CHECK_INTERVAL = _config.EMAIL_CHECK_INTERVAL  # minutos
+ENVIRONMENT = _config.ENVIRONMENT
 
 # === CATEGORÍAS PREDEFINIDAS ===
 CATEGORIAS_INGRESOS = [
@@ -152,14 +190,15 @@ Ejemplo 3 - Compra supermercado:
 def validar_configuracion():
     """Valida que las configuraciones necesarias estén presentes"""
     errores = []
+    config = get_config()
 
-    if not GOOGLE_API_KEY:
+    if not config.GOOGLE_API_KEY:
         errores.append("❌ GOOGLE_API_KEY no configurada en .env")
 
-    if not GMAIL_EMAIL:
+    if not config.GMAIL_EMAIL:
         errores.append("❌ GMAIL_EMAIL no configurado en .env")
 
-    if not GMAIL_PASSWORD:
+    if not config.GMAIL_PASSWORD:
         errores.append("❌ GMAIL_PASSWORD no configurado en .env")
 
     if errores:
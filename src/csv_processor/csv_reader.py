@@ -2,6 +2,7 @@
 Lector y procesador de archivos CSV con datos financieros
 Detecta automáticamente el formato y extrae transacciones
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -13,12 +14,12 @@ from datetime import datetime
 class CSVReader:
     """Lee y procesa archivos CSV con datos financieros"""
 
-    # Posibles nombres de columnas (en minúsculas)
-    COLUMNAS_FECHA = ["fecha", "date", "fecha_transaccion", "transaction_date", "día", "dia"]
-    COLUMNAS_MONTO = ["monto", "amount", "importe", "total", "valor", "precio"]
-    COLUMNAS_DESCRIPCION = ["descripcion", "description", "concepto", "detalle", "detail"]
-    COLUMNAS_CATEGORIA = ["categoria", "category", "tipo", "type", "rubro"]
-    COLUMNAS_EMISOR = ["emisor", "receptor", "proveedor", "supplier", "vendedor", "cliente"]
+    # Posibles nombres de columnas (en minúsculas, por orden de prioridad)
+    COLUMNAS_FECHA = ("fecha", "date", "fecha_transaccion", "transaction_date", "día", "dia")
+    COLUMNAS_MONTO = ("monto", "amount", "importe", "total", "valor", "precio")
+    COLUMNAS_DESCRIPCION = ("descripcion", "description", "concepto", "detalle", "detail")
+    COLUMNAS_CATEGORIA = ("categoria", "category", "tipo", "type", "rubro")
+    COLUMNAS_EMISOR = ("emisor", "receptor", "proveedor", "supplier", "vendedor", "cliente")
 
     def __init__(self):
         """Inicializa el lector de CSV"""
@@ -103,35 +104,24 @@ class CSVReader:
 
         mapeo = {}
 
-        # Buscar columna de fecha
-        for col_fecha in self.COLUMNAS_FECHA:
-            if col_fecha in columnas_minusculas:
-                mapeo['fecha'] = columnas_minusculas[col_fecha]
-                break
-
-        # Buscar columna de monto
-        for col_monto in self.COLUMNAS_MONTO:
-            if col_monto in columnas_minusculas:
-                mapeo['monto'] = columnas_minusculas[col_monto]
-                break
-
-        # Buscar columna de descripción
-        for col_desc in self.COLUMNAS_DESCRIPCION:
-            if col_desc in columnas_minusculas:
-                mapeo['descripcion'] = columnas_minusculas[col_desc]
-                break
-
-        # Buscar columna de categoría
-        for col_cat in self.COLUMNAS_CATEGORIA:
-            if col_cat in columnas_minusculas:
-                mapeo['categoria'] = columnas_minusculas[col_cat]
-                break
-
-        # Buscar columna de emisor/receptor
-        for col_emisor in self.COLUMNAS_EMISOR:
-            if col_emisor in columnas_minusculas:
-                mapeo['emisor_receptor'] = columnas_minusculas[col_emisor]
-                break
+        # Para cada tipo de dato, la primera candidata (en orden de
+        # prioridad) que exista en el CSV
+        candidatas_por_tipo = (
+            ('fecha', self.COLUMNAS_FECHA),
+            ('monto', self.COLUMNAS_MONTO),
+            ('descripcion', self.COLUMNAS_DESCRIPCION),
+            ('categoria', self.COLUMNAS_CATEGORIA),
+            ('emisor_receptor', self.COLUMNAS_EMISOR),
+        )
+
+        for tipo_dato, candidatas in candidatas_por_tipo:
+            columna = next(
+                (columnas_minusculas[cand] for cand in candidatas if cand in columnas_minusculas),
+                None
+            )
+
+            if columna is not None:
+                mapeo[tipo_dato] = columna
 
         logger.info(f"📋 Columnas identificadas: {list(mapeo.keys())}")
 
@@ -166,8 +156,11 @@ class CSVReader:
 
             transacciones = []
 
-            for idx, row in df.iterrows():
-                transaccion = self._extraer_transaccion(row, mapeo, ruta_archivo)
+            # Posición de cada columna mapeada para leer las filas como tuplas
+            col_idx = {clave: df.columns.get_loc(col) for clave, col in mapeo.items()}
+
+            for row in df.itertuples(index=False, name=None):
+                transaccion = self._extraer_transaccion(row, col_idx, ruta_archivo)
 
                 if transaccion:
                     transacciones.append(transaccion)
@@ -182,16 +175,16 @@ class CSVReader:
 
     def _extraer_transaccion(
         self,
-        row: pd.Series,
-        mapeo: Dict[str, str],
+        row: tuple,
+        col_idx: Dict[str, int],
         ruta_archivo: str
     ) -> Optional[Dict]:
         """
         Extrae una transacción de una fila del DataFrame
 
         Args:
-            row: Fila del DataFrame
-            mapeo: Mapeo de columnas
+            row: Fila del DataFrame como tupla (df.itertuples)
+            col_idx: Posición en la tupla de cada columna mapeada
             ruta_archivo: Ruta del archivo (para metadata)
 
         Returns:
@@ -199,7 +192,7 @@ class CSVReader:
         """
         try:
             # Extraer monto (obligatorio)
-            monto = self._limpiar_monto(row[mapeo['monto']])
+            monto = self._limpiar_monto(row[col_idx['monto']])
 
             if monto is None or monto == 0:
                 return None
@@ -213,23 +206,27 @@ class CSVReader:
 
             # Extraer fecha (si existe)
             fecha = None
-            if 'fecha' in mapeo:
-                fecha = self._parsear_fecha(row[mapeo['fecha']])
+            if 'fecha' in col_idx:
+                fecha = self._parsear_fecha(row[col_idx['fecha']])
 
+            # Los nulos llegan como None o NaN (NaN != NaN)
             # Extraer descripción
             descripcion = ""
-            if 'descripcion' in mapeo:
-                descripcion = str(row[mapeo['descripcion']]) if pd.notna(row[mapeo['descripcion']]) else ""
+            if 'descripcion' in col_idx:
+                valor = row[col_idx['descripcion']]
+                descripcion = str(valor) if valor is not None and valor == valor else ""
 
             # Extraer categoría
             categoria = None
-            if 'categoria' in mapeo:
-                categoria = str(row[mapeo['categoria']]) if pd.notna(row[mapeo['categoria']]) else None
+            if 'categoria' in col_idx:
+                valor = row[col_idx['categoria']]
+                categoria = str(valor) if valor is not None and valor == valor else None
 
             # Extraer emisor/receptor
             emisor_receptor = None
-            if 'emisor_receptor' in mapeo:
-                emisor_receptor = str(row[mapeo['emisor_receptor']]) if pd.notna(row[mapeo['emisor_receptor']]) else None
+            if 'emisor_receptor' in col_idx:
+                valor = row[col_idx['emisor_receptor']]
+                emisor_receptor = str(valor) if valor is not None and valor == valor else None
 
             transaccion = {
                 "tipo": tipo,
@@ -260,6 +257,10 @@ class CSVReader:
             Float o None si no se puede convertir
         """
         try:
+            # Camino rápido: columnas numéricas no necesitan limpieza de texto
+            if isinstance(valor, (int, float, np.integer, np.floating)) and not isinstance(valor, bool):
+                return None if pd.isna(valor) else float(valor)
+
             if pd.isna(valor):
                 return None
 
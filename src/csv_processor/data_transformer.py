@@ -3,9 +3,23 @@ Transformador de datos CSV
 Categoriza transacciones usando reglas y palabras clave
 """
 from typing import Dict, List, Optional
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from loguru import logger
+import pandas as pd
+import os
 import re
 
+# A partir de esta cantidad conviene agregar con pandas en lugar de Python puro
+UMBRAL_ESTADISTICAS_DATAFRAME = 1000
+
+# Por debajo de esta cantidad el costo de lanzar procesos supera la ganancia
+UMBRAL_CATEGORIZACION_PARALELA = 200_000
+
+# Campos que transformar_batch limpia o categoriza
+COLUMNAS_TRANSFORMACION = ("tipo", "categoria", "monto", "fecha", "descripcion", "emisor_receptor")
+
 
 class DataTransformer:
     """Transforma y categoriza datos de transacciones CSV"""
@@ -21,6 +35,10 @@ class DataTransformer:
         self.categorias_ingresos = categorias_ingresos
         self.categorias_egresos = categorias_egresos
 
+        # Sets para validar categorías en O(1)
+        self._cat_ing_set = set(categorias_ingresos)
+        self._cat_egr_set = set(categorias_egresos)
+
         # Reglas de categorización por palabras clave
         self.reglas_ingresos = {
             "sueldo": ["sueldo", "salario", "salary", "payroll", "remuneracion", "haberes"],
@@ -54,6 +72,27 @@ class DataTransformer:
             ],
         }
 
+        # Un patrón por categoría (todas sus palabras clave en una alternancia)
+        # para categorizar columnas enteras de un DataFrame
+        self._patrones_ingresos = self._compilar_patrones(self.reglas_ingresos)
+        self._patrones_egresos = self._compilar_patrones(self.reglas_egresos)
+
+    @staticmethod
+    def _compilar_patrones(reglas: Dict[str, List[str]]) -> List[tuple]:
+        """
+        Construye un patrón regex por categoría respetando el orden de las reglas
+
+        Args:
+            reglas: Diccionario de categoría -> palabras clave
+
+        Returns:
+            Lista de tuplas (categoría, patrón)
+        """
+        return [
+            (categoria, r'\b(?:' + '|'.join(re.escape(p.lower()) for p in palabras) + r')\b')
+            for categoria, palabras in reglas.items()
+        ]
+
     def categorizar_transaccion(self, transaccion: Dict) -> Dict:
         """
         Categoriza una transacción basándose en su descripción y tipo
@@ -69,11 +108,11 @@ class DataTransformer:
             return transaccion
 
         tipo = transaccion.get("tipo")
-        descripcion = transaccion.get("descripcion", "").lower()
-        emisor_receptor = transaccion.get("emisor_receptor", "").lower()
+        descripcion = transaccion.get("descripcion") or ""
+        emisor_receptor = transaccion.get("emisor_receptor") or ""
 
-        # Combinar descripción y emisor para análisis
-        texto_completo = f"{descripcion} {emisor_receptor}"
+        # Combinar descripción y emisor para análisis (un solo lower)
+        texto_completo = f"{descripcion} {emisor_receptor}".lower()
 
         if tipo == "ingreso":
             categoria = self._buscar_categoria(texto_completo, self.reglas_ingresos)
@@ -130,9 +169,9 @@ class DataTransformer:
             return False
 
         if tipo == "ingreso":
-            return categoria in self.categorias_ingresos
+            return categoria in self._cat_ing_set
         elif tipo == "egreso":
-            return categoria in self.categorias_egresos
+            return categoria in self._cat_egr_set
         else:
             return False
 
@@ -165,6 +204,41 @@ class DataTransformer:
 
         return transacciones_categorizadas
 
+    def categorizar_lote_paralelo(
+        self,
+        transacciones: List[Dict],
+        n_workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Categoriza un lote muy grande repartiéndolo entre varios procesos
+
+        Lotes por debajo de UMBRAL_CATEGORIZACION_PARALELA se categorizan
+        en el proceso actual con categorizar_lote.
+
+        Args:
+            transacciones: Lista de transacciones
+            n_workers: Cantidad de procesos (por defecto, uno por CPU)
+
+        Returns:
+            Lista de transacciones categorizadas, en el mismo orden
+        """
+        n_workers = n_workers or os.cpu_count() or 1
+
+        if len(transacciones) <= UMBRAL_CATEGORIZACION_PARALELA or n_workers < 2:
+            return self.categorizar_lote(transacciones)
+
+        tamano_bloque = -(-len(transacciones) // n_workers)  # División redondeando hacia arriba
+        bloques = [
+            transacciones[i:i + tamano_bloque]
+            for i in range(0, len(transacciones), tamano_bloque)
+        ]
+
+        logger.info(f"⚙️  Categorizando {len(transacciones)} transacciones en {len(bloques)} procesos...")
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            resultados = executor.map(self.categorizar_lote, bloques)
+            return [t for bloque in resultados for t in bloque]
+
     def limpiar_transaccion(self, transaccion: Dict) -> Dict:
         """
         Limpia y normaliza los datos de una transacción
@@ -197,6 +271,11 @@ class DataTransformer:
         """
         Transforma un lote completo de transacciones
 
+        Limpia y categoriza todo el lote en una sola pasada sobre un DataFrame
+        y vuelca el resultado en los mismos diccionarios: queda igual que
+        aplicar limpiar_transaccion y categorizar_transaccion fila por fila
+        (mismas claves, monto como float y el resto de los valores intactos).
+
         Args:
             transacciones: Lista de transacciones
 
@@ -205,20 +284,100 @@ class DataTransformer:
         """
         logger.info(f"🔄 Transformando {len(transacciones)} transacciones...")
 
-        transacciones_transformadas = []
+        if not transacciones:
+            return []
 
-        for transaccion in transacciones:
-            # Limpiar
-            transaccion = self.limpiar_transaccion(transaccion)
+        # Solo las columnas que se limpian o categorizan (faltantes -> NaN)
+        df = pd.DataFrame(transacciones, columns=list(COLUMNAS_TRANSFORMACION))
+        cambios = {}
 
-            # Categorizar
-            transaccion = self.categorizar_transaccion(transaccion)
+        # Limpiar strings (solo los valores de texto)
+        for columna in ("descripcion", "emisor_receptor"):
+            if not pd.api.types.is_numeric_dtype(df[columna]):
+                limpia = df[columna].str.strip()
+                df[columna] = limpia.where(limpia.notna(), df[columna])
+                cambios[columna] = limpia[limpia.notna()]
 
-            transacciones_transformadas.append(transaccion)
+        # Normalizar monto (asegurar que sea positivo; 0 y nulos quedan igual)
+        montos = pd.to_numeric(df["monto"], errors="coerce")
+        cambios["monto"] = montos[montos.notna() & (montos != 0)].abs().astype(float)
+
+        # Asegurar que tenga fecha (usar hoy si no tiene)
+        sin_fecha = df["fecha"].isna() | df["fecha"].isin(("",))
+        cambios["fecha"] = pd.Series(datetime.now().strftime('%Y-%m-%d'), index=df.index[sin_fecha])
+
+        # Categorizar
+        cambios["categoria"] = self._categorizar_dataframe(df)
+
+        # Volcar los valores nuevos en los diccionarios originales
+        for columna, valores in cambios.items():
+            for posicion, valor in zip(valores.index.tolist(), valores.tolist()):
+                transacciones[posicion][columna] = valor
 
         logger.info(f"✅ Transformación completada")
 
-        return transacciones_transformadas
+        return transacciones
+
+    def _categorizar_dataframe(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Categoriza las filas de un DataFrame sin categoría válida
+
+        Args:
+            df: DataFrame con columnas tipo, categoria, descripcion y emisor_receptor
+
+        Returns:
+            Categoría asignada a cada fila que no tenía una válida (None si el
+            tipo es inválido), con el índice del DataFrame
+        """
+        es_ingreso = df["tipo"] == "ingreso"
+        es_egreso = df["tipo"] == "egreso"
+
+        # Si ya tiene categoría válida, no hacer nada
+        validas = (
+            (es_ingreso & df["categoria"].isin(self._cat_ing_set)) |
+            (es_egreso & df["categoria"].isin(self._cat_egr_set))
+        )
+        pendientes = ~validas
+        categorias = pd.Series([None] * int(pendientes.sum()), index=df.index[pendientes], dtype=object)
+
+        if categorias.empty:
+            return categorias
+
+        # Combinar descripción y emisor para análisis (nulos y vacíos -> "")
+        descripcion = df["descripcion"].fillna("")
+        emisor_receptor = df["emisor_receptor"].fillna("")
+        texto_completo = (
+            descripcion.where(descripcion.astype(bool), "").astype(str) + " " +
+            emisor_receptor.where(emisor_receptor.astype(bool), "").astype(str)
+        ).str.lower()
+
+        grupos = (
+            (es_ingreso, self._patrones_ingresos, "otro_ingreso"),
+            (es_egreso, self._patrones_egresos, "otro_egreso"),
+        )
+
+        for es_tipo, patrones, categoria_defecto in grupos:
+            mascara = pendientes & es_tipo
+            if not mascara.any():
+                continue
+
+            texto = texto_completo[mascara]
+            asignadas = pd.Series(categoria_defecto, index=texto.index, dtype=object)
+            sin_asignar = pd.Series(True, index=texto.index)
+
+            # La primera categoría que coincide gana, igual que _buscar_categoria
+            for categoria, patron in patrones:
+                coincide = sin_asignar & texto.str.contains(patron, regex=True)
+                asignadas[coincide] = categoria
+                sin_asignar &= ~coincide
+
+            categorias[asignadas.index] = asignadas
+
+        invalidas = pendientes & ~(es_ingreso | es_egreso)
+        if invalidas.any():
+            logger.warning(f"Tipo de transacción inválido en {int(invalidas.sum())} transacciones")
+
+        return categorias
 
     def agrupar_por_categoria(self, transacciones: List[Dict]) -> Dict[str, List[Dict]]:
         """
@@ -230,17 +389,12 @@ class DataTransformer:
         Returns:
             Diccionario de categoría -> lista de transacciones
         """
-        grupos = {}
+        grupos = defaultdict(list)
 
         for transaccion in transacciones:
-            categoria = transaccion.get("categoria", "sin_categoria")
-
-            if categoria not in grupos:
-                grupos[categoria] = []
+            grupos[transaccion.get("categoria", "sin_categoria")].append(transaccion)
 
-            grupos[categoria].append(transaccion)
-
-        return grupos
+        return dict(grupos)
 
     def calcular_estadisticas(self, transacciones: List[Dict]) -> Dict:
         """
@@ -261,18 +415,39 @@ class DataTransformer:
                 "cantidad_egresos": 0
             }
 
-        ingresos = [t for t in transacciones if t.get("tipo") == "ingreso"]
-        egresos = [t for t in transacciones if t.get("tipo") == "egreso"]
+        if len(transacciones) > UMBRAL_ESTADISTICAS_DATAFRAME:
+            # Lotes grandes: una sola agregación vectorizada
+            df = pd.DataFrame(transacciones, columns=["tipo", "monto"])
+            df["monto"] = df["monto"].fillna(0)
+            grp = df.groupby("tipo")["monto"].agg(["sum", "count"])
+
+            def _agregado(tipo: str, columna: str):
+                return grp.loc[tipo, columna] if tipo in grp.index else 0
 
-        total_ingresos = sum(t.get("monto", 0) for t in ingresos)
-        total_egresos = sum(t.get("monto", 0) for t in egresos)
+            total_ingresos = float(_agregado("ingreso", "sum"))
+            total_egresos = float(_agregado("egreso", "sum"))
+            cantidad_ingresos = int(_agregado("ingreso", "count"))
+            cantidad_egresos = int(_agregado("egreso", "count"))
+        else:
+            # Lotes chicos: una sola pasada en Python
+            total_ingresos = total_egresos = 0
+            cantidad_ingresos = cantidad_egresos = 0
+
+            for t in transacciones:
+                tipo = t.get("tipo")
+                if tipo == "ingreso":
+                    total_ingresos += t.get("monto", 0)
+                    cantidad_ingresos += 1
+                elif tipo == "egreso":
+                    total_egresos += t.get("monto", 0)
+                    cantidad_egresos += 1
 
         return {
             "total_transacciones": len(transacciones),
             "total_ingresos": round(total_ingresos, 2),
             "total_egresos": round(total_egresos, 2),
-            "cantidad_ingresos": len(ingresos),
-            "cantidad_egresos": len(egresos),
+            "cantidad_ingresos": cantidad_ingresos,
+            "cantidad_egresos": cantidad_egresos,
             "balance": round(total_ingresos - total_egresos, 2)
         }
 
@@ -3,11 +3,13 @@ Dashboard Profesional de FacturIA 2.1.0 con Streamlit
 Sistema avanzado de análisis financiero multi-persona con KPIs profesionales
 """
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
+import math
 from datetime import datetime, timedelta
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
 import sys
 from typing import Dict, List, Optional
@@ -19,11 +21,13 @@ sys.path.insert(0, str(BASE_DIR))
 from src.database import (
     get_database,
     obtener_transacciones,
+    obtener_filas_transacciones,
+    contar_transacciones,
     calcular_estadisticas_periodo,
     obtener_top_categorias,
     obtener_totales_mes_actual
 )
-from src.database.models import TipoTransaccion
+from src.database.models import Transaccion, TipoTransaccion, OrigenArchivo
 from src.config import CATEGORIAS_INGRESOS, CATEGORIAS_EGRESOS
 
 # ==================== CONFIGURACIÓN ====================
@@ -35,8 +39,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS Profesional Mejorado
-st.markdown("""
+# CSS Profesional Mejorado (constante de módulo: se arma una sola vez por proceso)
+ESTILOS_CSS = """
     <style>
     /* Variables de colores profesionales */
     :root {
@@ -145,7 +149,61 @@ st.markdown("""
         border-left: 4px solid #00CC66;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit descarta los elementos que no se vuelven a emitir en cada rerun,
+# así que el bloque de estilos se envía siempre (ya armado)
+st.markdown(ESTILOS_CSS, unsafe_allow_html=True)
+
+
+# Columnas que usan la tabla de transacciones y las exportaciones
+COLUMNAS_TABLA_TRANSACCIONES = [
+    Transaccion.id,
+    Transaccion.fecha_transaccion,
+    Transaccion.persona,
+    Transaccion.tipo,
+    Transaccion.categoria,
+    Transaccion.monto,
+    Transaccion.emisor_receptor,
+    Transaccion.descripcion,
+    Transaccion.origen,
+    Transaccion.numero_comprobante,
+    Transaccion.procesado_por_ia,
+    Transaccion.requiere_revision,
+    Transaccion.editado_manualmente
+]
+
+
+# Columnas de la tabla (clave del modelo -> encabezado visible)
+COLUMNAS_DATAFRAME_TRANSACCIONES = {
+    "id": "ID",
+    "fecha_transaccion": "Fecha",
+    "persona": "Persona",
+    "tipo": "Tipo",
+    "categoria": "Categoría",
+    "monto": "Monto",
+    "emisor_receptor": "Emisor/Receptor",
+    "descripcion": "Descripción",
+    "origen": "Origen"
+}
+
+# Valor de texto de cada enum, para mapear columnas completas sin recorrer filas
+VALORES_ENUM = {
+    **{tipo: tipo.value for tipo in TipoTransaccion},
+    **{origen: origen.value for origen in OrigenArchivo}
+}
+
+# Filas por página en la tabla de transacciones
+TAMANO_PAGINA_TABLA = 25
+
+# Filas por consulta al exportar a CSV
+TAMANO_PAGINA_EXPORTACION = 500
+
+# Máximo de transacciones en las exportaciones Excel/PDF
+LIMITE_EXPORTACION = 200
+
+# Intercambia los separadores del formato en inglés (1,234.56 -> 1.234,56)
+SEPARADORES_MONTO = str.maketrans(",.", ".,")
 
 
 # ==================== FUNCIONES AUXILIARES ====================
@@ -161,9 +219,21 @@ def inicializar_db():
         return None
 
 
+@lru_cache(maxsize=4096)
 def formatear_monto(monto: float) -> str:
-    """Formatea un monto con símbolo de pesos y separadores"""
-    return f"${monto:,.2f}".replace(",", ".")
+    """
+    Formatea un monto con símbolo de pesos y separadores (punto de miles,
+    coma decimal)
+
+    Se llama con los mismos totales en KPIs, categorías y rankings; el
+    cache evita reformatear el mismo valor en cada rerun.
+    """
+    return f"${monto:,.2f}".translate(SEPARADORES_MONTO)
+
+
+def formatear_montos(montos: pd.Series) -> pd.Series:
+    """Versión vectorizada de formatear_monto para columnas completas"""
+    return ("$" + montos.map("{:,.2f}".format)).str.translate(SEPARADORES_MONTO)
 
 
 def formatear_porcentaje(valor: float) -> str:
@@ -181,12 +251,35 @@ def calcular_variacion_porcentual(actual: float, anterior: float) -> float:
 # ==================== FUNCIONES DE DATOS ====================
 
 def obtener_personas_unicas(session) -> List[str]:
-    """Obtiene lista de personas únicas en las transacciones"""
-    from sqlalchemy import distinct
-    from src.database.models import Transaccion
+    """
+    Obtiene lista de personas únicas en las transacciones
+
+    En lugar de un DISTINCT que recorre toda la tabla, salta de persona en
+    persona sobre el índice de la columna (MIN(persona) WHERE persona > anterior),
+    así el costo depende de la cantidad de personas y no de transacciones.
+    """
+    from sqlalchemy import func, select
+
+    personas = select(func.min(Transaccion.persona).label("persona")).cte("personas", recursive=True)
+    siguiente = select(
+        select(func.min(Transaccion.persona))
+        .where(Transaccion.persona > personas.c.persona)
+        .scalar_subquery()
+    ).where(personas.c.persona.is_not(None))
+    personas = personas.union_all(siguiente)
+
+    resultado = session.execute(select(personas.c.persona)).scalars().all()
+    return [p for p in resultado if p]
 
-    personas = session.query(distinct(Transaccion.persona)).all()
-    return [p[0] for p in personas if p[0]]
+
+@st.cache_data(ttl=600, show_spinner=False)
+def obtener_personas_cacheadas(_session) -> List[str]:
+    """
+    Versión cacheada de obtener_personas_unicas
+
+    La lista cambia muy poco; se invalida con el botón "Refrescar".
+    """
+    return obtener_personas_unicas(_session)
 
 
 def calcular_estadisticas_por_persona(
@@ -196,52 +289,162 @@ def calcular_estadisticas_por_persona(
     persona: Optional[str] = None
 ) -> Dict:
     """Calcula estadísticas para una persona específica o todas"""
-    from src.database.models import Transaccion
-    from sqlalchemy import and_
+    df = consultar_agregados_periodos(session, [(fecha_inicio, fecha_fin)], persona)
 
-    query = session.query(Transaccion).filter(
-        and_(
-            Transaccion.fecha_transaccion >= fecha_inicio,
-            Transaccion.fecha_transaccion <= fecha_fin
-        )
+    return estadisticas_desde_agregados(df, fecha_inicio, fecha_fin, persona)
+
+
+def calcular_estadisticas_con_anterior(
+    session,
+    fecha_inicio: datetime,
+    fecha_fin: datetime,
+    fecha_inicio_anterior: datetime,
+    fecha_fin_anterior: datetime,
+    persona: Optional[str] = None
+) -> tuple:
+    """
+    Calcula las estadísticas del período actual y del anterior con una sola consulta
+
+    Returns:
+        Tupla (stats_actual, stats_anterior)
+    """
+    df = consultar_agregados_periodos(
+        session,
+        [(fecha_inicio, fecha_fin), (fecha_inicio_anterior, fecha_fin_anterior)],
+        persona
+    )
+
+    stats_actual = estadisticas_desde_agregados(
+        df[df["periodo"] == 0], fecha_inicio, fecha_fin, persona
+    )
+    stats_anterior = estadisticas_desde_agregados(
+        df[df["periodo"] == 1], fecha_inicio_anterior, fecha_fin_anterior, persona
     )
+    return stats_actual, stats_anterior
+
+
+def calcular_estadisticas_personas(
+    session,
+    fecha_inicio: datetime,
+    fecha_fin: datetime,
+    personas: List[str]
+) -> Dict:
+    """
+    Calcula las estadísticas de varias personas con una sola consulta
+
+    Returns:
+        Diccionario persona -> estadísticas (mismo formato que
+        calcular_estadisticas_por_persona)
+    """
+    df = consultar_agregados_periodos(session, [(fecha_inicio, fecha_fin)], personas=personas)
+    grupos = dict(tuple(df.groupby("persona"))) if not df.empty else {}
+
+    return {
+        persona: estadisticas_desde_agregados(
+            grupos.get(persona, df.iloc[0:0]), fecha_inicio, fecha_fin, persona
+        )
+        for persona in personas
+    }
+
+
+def consultar_agregados_periodos(
+    session,
+    periodos: List[tuple],
+    persona: Optional[str] = None,
+    personas: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Agrega montos por (período, tipo, categoría, día) en un único GROUP BY
+
+    Args:
+        session: Sesión de SQLAlchemy
+        periodos: Lista de rangos (fecha_inicio, fecha_fin); la columna
+            "periodo" del resultado es la posición del rango en la lista
+        persona: Persona a filtrar (None o "Todas" para todas)
+        personas: Si se indica, filtra por esas personas y agrega además
+            por persona (columna "persona" en el resultado)
+
+    Returns:
+        DataFrame con columnas periodo, tipo, categoria, dia, monto, cantidad
+    """
+    from sqlalchemy import Date, and_, case, func, literal, or_, select
+
+    fecha = Transaccion.fecha_transaccion
+    rangos = [and_(fecha >= inicio, fecha <= fin) for inicio, fin in periodos]
+
+    filtros = [or_(*rangos)]
 
     if persona and persona != "Todas":
-        query = query.filter(Transaccion.persona == persona)
+        filtros.append(Transaccion.persona == persona)
+
+    # La base de datos agrega (totales por día incluidos) y pandas reparte
+    # ese resultado chico en totales, categorías y días
+    dia = func.date(fecha, type_=Date).label("dia")
+    agrupacion = [Transaccion.tipo, Transaccion.categoria, dia]
+    columnas_extra = []
+
+    if personas is not None:
+        filtros.append(Transaccion.persona.in_(personas))
+        agrupacion.insert(0, Transaccion.persona)
+        columnas_extra.append(Transaccion.persona)
+
+    if len(rangos) == 1:
+        # Constante sin agrupar: un GROUP BY 0 se leería como posición de columna
+        periodo = literal(0).label("periodo")
+    else:
+        periodo = case(*[(rango, i) for i, rango in enumerate(rangos)]).label("periodo")
+        agrupacion.insert(0, periodo)
 
-    transacciones = query.all()
+    stmt = select(
+        *columnas_extra,
+        periodo,
+        Transaccion.tipo,
+        Transaccion.categoria,
+        dia,
+        func.sum(Transaccion.monto).label("monto"),
+        func.count(Transaccion.id).label("cantidad")
+    ).where(*filtros).group_by(*agrupacion)
+
+    resultado = session.execute(stmt)
+    return pd.DataFrame(resultado.all(), columns=list(resultado.keys()))
 
-    # Calcular totales
-    ingresos = [t for t in transacciones if t.tipo == TipoTransaccion.INGRESO]
-    egresos = [t for t in transacciones if t.tipo == TipoTransaccion.EGRESO]
 
-    total_ingresos = sum(t.monto for t in ingresos)
-    total_egresos = sum(t.monto for t in egresos)
+def estadisticas_desde_agregados(
+    df: pd.DataFrame,
+    fecha_inicio: datetime,
+    fecha_fin: datetime,
+    persona: Optional[str] = None
+) -> Dict:
+    """Arma el diccionario de estadísticas a partir de los agregados de un período"""
+    df = df.copy()
+
+    es_ingreso = df["tipo"] == TipoTransaccion.INGRESO
+    df["ingresos"] = df["monto"].where(es_ingreso, 0)
+    df["egresos"] = df["monto"].where(~es_ingreso, 0)
+
+    # Calcular totales
+    total_ingresos = float(df["ingresos"].sum())
+    total_egresos = float(df["egresos"].sum())
     balance = total_ingresos - total_egresos
 
+    total_transacciones = int(df["cantidad"].sum())
+    cantidad_ingresos = int(df.loc[es_ingreso, "cantidad"].sum())
+    cantidad_egresos = total_transacciones - cantidad_ingresos
+
     # Agrupar por categoría
-    categorias_ingresos = {}
-    for t in ingresos:
-        cat = t.categoria
-        categorias_ingresos[cat] = categorias_ingresos.get(cat, 0) + t.monto
-
-    categorias_egresos = {}
-    for t in egresos:
-        cat = t.categoria
-        categorias_egresos[cat] = categorias_egresos.get(cat, 0) + t.monto
-
-    # Análisis temporal
-    transacciones_por_dia = {}
-    for t in transacciones:
-        fecha = t.fecha_transaccion.date() if t.fecha_transaccion else None
-        if fecha:
-            if fecha not in transacciones_por_dia:
-                transacciones_por_dia[fecha] = {"ingresos": 0, "egresos": 0}
-
-            if t.tipo == TipoTransaccion.INGRESO:
-                transacciones_por_dia[fecha]["ingresos"] += t.monto
-            else:
-                transacciones_por_dia[fecha]["egresos"] += t.monto
+    categorias_ingresos = df[es_ingreso].groupby("categoria")["monto"].sum().to_dict()
+    categorias_egresos = df[~es_ingreso].groupby("categoria")["monto"].sum().to_dict()
+
+    # Análisis temporal: índice entero por día y acumulación directa en arrays
+    con_dia = df.dropna(subset=["dia"])
+    indice_dia, dias = pd.factorize(con_dia["dia"], sort=True)
+    ingresos_dia = np.bincount(indice_dia, weights=con_dia["ingresos"].to_numpy(dtype=float), minlength=len(dias))
+    egresos_dia = np.bincount(indice_dia, weights=con_dia["egresos"].to_numpy(dtype=float), minlength=len(dias))
+
+    transacciones_por_dia = {
+        d: {"ingresos": float(i), "egresos": float(e)}
+        for d, i, e in zip(dias, ingresos_dia, egresos_dia)
+    }
 
     # Calcular días con datos
     dias_periodo = (fecha_fin - fecha_inicio).days + 1
@@ -255,12 +458,12 @@ def calcular_estadisticas_por_persona(
         "persona": persona or "Todas",
         "fecha_inicio": fecha_inicio.isoformat(),
         "fecha_fin": fecha_fin.isoformat(),
-        "total_transacciones": len(transacciones),
+        "total_transacciones": total_transacciones,
         "total_ingresos": round(total_ingresos, 2),
         "total_egresos": round(total_egresos, 2),
         "balance": round(balance, 2),
-        "cantidad_ingresos": len(ingresos),
-        "cantidad_egresos": len(egresos),
+        "cantidad_ingresos": cantidad_ingresos,
+        "cantidad_egresos": cantidad_egresos,
         "categorias_ingresos": {k: round(v, 2) for k, v in categorias_ingresos.items()},
         "categorias_egresos": {k: round(v, 2) for k, v in categorias_egresos.items()},
         "transacciones_por_dia": transacciones_por_dia,
@@ -271,6 +474,137 @@ def calcular_estadisticas_por_persona(
     }
 
 
+@st.cache_data(ttl=300)
+def obtener_estadisticas_cacheadas(
+    _session,
+    persona: Optional[str],
+    fecha_inicio_iso: str,
+    fecha_fin_iso: str
+) -> Dict:
+    """
+    Versión cacheada de calcular_estadisticas_por_persona
+
+    La sesión lleva guion bajo para que Streamlit no la use en la clave
+    del cache; las fechas van en ISO para que la clave sea estable.
+    """
+    return calcular_estadisticas_por_persona(
+        _session,
+        datetime.fromisoformat(fecha_inicio_iso),
+        datetime.fromisoformat(fecha_fin_iso),
+        persona
+    )
+
+
+@st.cache_data(ttl=300)
+def obtener_estadisticas_comparadas_cacheadas(
+    _session,
+    persona: Optional[str],
+    fecha_inicio_iso: str,
+    fecha_fin_iso: str,
+    fecha_inicio_anterior_iso: str,
+    fecha_fin_anterior_iso: str
+) -> tuple:
+    """Versión cacheada de calcular_estadisticas_con_anterior"""
+    return calcular_estadisticas_con_anterior(
+        _session,
+        datetime.fromisoformat(fecha_inicio_iso),
+        datetime.fromisoformat(fecha_fin_iso),
+        datetime.fromisoformat(fecha_inicio_anterior_iso),
+        datetime.fromisoformat(fecha_fin_anterior_iso),
+        persona
+    )
+
+
+@st.cache_data(ttl=300)
+def obtener_estadisticas_personas_cacheadas(
+    _session,
+    personas: tuple,
+    fecha_inicio_iso: str,
+    fecha_fin_iso: str
+) -> Dict:
+    """Versión cacheada de calcular_estadisticas_personas"""
+    return calcular_estadisticas_personas(
+        _session,
+        datetime.fromisoformat(fecha_inicio_iso),
+        datetime.fromisoformat(fecha_fin_iso),
+        list(personas)
+    )
+
+
+def calcular_totales_por_persona(
+    session,
+    fecha_inicio: datetime,
+    fecha_fin: datetime,
+    personas: List[str]
+) -> Dict:
+    """
+    Totales de ingresos, egresos y cantidad por persona en una sola consulta
+
+    Returns:
+        Diccionario persona -> {"ingresos", "egresos", "cantidad"}
+    """
+    from sqlalchemy import func, select
+
+    filas = session.execute(
+        select(
+            Transaccion.persona,
+            Transaccion.tipo,
+            func.sum(Transaccion.monto),
+            func.count(Transaccion.id)
+        ).where(
+            Transaccion.fecha_transaccion >= fecha_inicio,
+            Transaccion.fecha_transaccion <= fecha_fin,
+            Transaccion.persona.in_(personas)
+        ).group_by(Transaccion.persona, Transaccion.tipo)
+    ).all()
+
+    totales = {persona: {"ingresos": 0, "egresos": 0, "cantidad": 0} for persona in personas}
+    for persona, tipo, total, cantidad in filas:
+        clave = "ingresos" if tipo == TipoTransaccion.INGRESO else "egresos"
+        totales[persona][clave] += total
+        totales[persona]["cantidad"] += cantidad
+
+    return totales
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def obtener_totales_personas_cacheados(
+    _session,
+    personas: tuple,
+    fecha_inicio_iso: str,
+    fecha_fin_iso: str
+) -> Dict:
+    """Versión cacheada de calcular_totales_por_persona"""
+    return calcular_totales_por_persona(
+        _session,
+        datetime.fromisoformat(fecha_inicio_iso),
+        datetime.fromisoformat(fecha_fin_iso),
+        list(personas)
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def contar_transacciones_cacheado(
+    _session,
+    tipo: Optional[str],
+    categoria: Optional[str],
+    fecha_desde_iso: Optional[str],
+    fecha_hasta_iso: Optional[str]
+) -> Dict:
+    """
+    Versión cacheada de contar_transacciones
+
+    TTL corto: el conteo define las páginas de la tabla, que no se cachea.
+    """
+    return contar_transacciones(
+        _session,
+        tipo=tipo,
+        categoria=categoria,
+        fecha_desde=datetime.fromisoformat(fecha_desde_iso) if fecha_desde_iso else None,
+        fecha_hasta=datetime.fromisoformat(fecha_hasta_iso) if fecha_hasta_iso else None
+    )
+
+
 def calcular_ratios_financieros(stats: Dict, stats_anterior: Optional[Dict] = None) -> Dict:
     """Calcula ratios financieros profesionales"""
     ingresos = stats['total_ingresos']
@@ -285,16 +619,24 @@ def calcular_ratios_financieros(stats: Dict, stats_anterior: Optional[Dict] = No
 
     # Proyecciones
     dias_hasta_cero = (balance / burn_rate) if burn_rate > 0 and balance > 0 else float('inf')
+    ingresos_proyectados = stats['promedio_ingreso_dia'] * 30
+    egresos_proyectados = stats['promedio_egreso_dia'] * 30
 
     # Eficiencia de gasto
     eficiencia_gasto = (1 - (egresos / ingresos)) * 100 if ingresos > 0 else 0
 
+    # El gasto diario promedio es el mismo burn rate
+    burn_rate = round(burn_rate, 2)
+
     ratios = {
         "tasa_ahorro": round(tasa_ahorro, 2),
-        "ratio_ingreso_egreso": round(ratio_ingreso_egreso, 2) if ratio_ingreso_egreso != float('inf') else 0,
-        "burn_rate": round(burn_rate, 2),
-        "promedio_gasto_diario": round(burn_rate, 2),
-        "dias_hasta_cero": int(dias_hasta_cero) if dias_hasta_cero != float('inf') else None,
+        "ratio_ingreso_egreso": round(ratio_ingreso_egreso, 2) if math.isfinite(ratio_ingreso_egreso) else 0,
+        "burn_rate": burn_rate,
+        "promedio_gasto_diario": burn_rate,
+        "dias_hasta_cero": int(dias_hasta_cero) if math.isfinite(dias_hasta_cero) else None,
+        "ingresos_proyectados_mes": ingresos_proyectados,
+        "egresos_proyectados_mes": egresos_proyectados,
+        "balance_proyectado_mes": ingresos_proyectados - egresos_proyectados,
         "eficiencia_gasto": round(eficiencia_gasto, 2)
     }
 
@@ -361,6 +703,34 @@ def mostrar_kpis_profesionales(stats: Dict, ratios: Dict):
         st.caption(f"Ratio I/E: {ratios['ratio_ingreso_egreso']:.2f}x | Burn rate: {formatear_monto(ratios['burn_rate'])}/día")
 
 
+@st.cache_data
+def figura_tasa_ahorro(tasa_ahorro: float) -> Dict:
+    """Construye el indicador de tasa de ahorro (cacheado por valor)"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=tasa_ahorro,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [-100, 100]},
+            'bar': {'color': "darkgreen" if tasa_ahorro > 0 else "darkred"},
+            'steps': [
+                {'range': [-100, 0], 'color': "lightgray"},
+                {'range': [0, 100], 'color': "lightgreen"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 20
+            }
+        }
+    ))
+    fig.update_layout(height=200, margin=dict(l=20, r=20, t=20, b=20))
+
+    return fig.to_dict()
+
+
 def mostrar_ratios_financieros(ratios: Dict):
     """Muestra ratios financieros profesionales"""
 
@@ -374,26 +744,7 @@ def mostrar_ratios_financieros(ratios: Dict):
         st.markdown(f"<h2 style='color:{color};'>{formatear_porcentaje(ratios['tasa_ahorro'])}</h2>", unsafe_allow_html=True)
 
         # Indicador visual
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=ratios['tasa_ahorro'],
-            domain={'x': [0, 1], 'y': [0, 1]},
-            gauge={
-                'axis': {'range': [-100, 100]},
-                'bar': {'color': "darkgreen" if ratios['tasa_ahorro'] > 0 else "darkred"},
-                'steps': [
-                    {'range': [-100, 0], 'color': "lightgray"},
-                    {'range': [0, 100], 'color': "lightgreen"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 20
-                }
-            }
-        ))
-        fig.update_layout(height=200, margin=dict(l=20, r=20, t=20, b=20))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figura_tasa_ahorro(ratios['tasa_ahorro']), use_container_width=True)
 
     with col2:
         st.markdown("**🔥 Burn Rate (Gasto Diario)**")
@@ -431,20 +782,15 @@ def mostrar_ratios_financieros(ratios: Dict):
             st.error("⚠️ Revisar gastos")
 
 
-def grafico_evolucion_temporal(stats: Dict):
-    """Gráfico de evolución temporal de ingresos y egresos"""
+@st.cache_data
+def figura_evolucion_temporal(fechas: tuple, ingresos: tuple, egresos: tuple) -> Dict:
+    """Construye la figura de evolución temporal (cacheada por datos)"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
 
-    transacciones_dia = stats['transacciones_por_dia']
-
-    if not transacciones_dia:
-        st.info("No hay datos temporales para mostrar")
-        return
-
-    # Preparar datos
-    fechas = sorted(transacciones_dia.keys())
-    ingresos_dia = [transacciones_dia[f]["ingresos"] for f in fechas]
-    egresos_dia = [transacciones_dia[f]["egresos"] for f in fechas]
-    balance_dia = [transacciones_dia[f]["ingresos"] - transacciones_dia[f]["egresos"] for f in fechas]
+    ingresos_dia = np.array(ingresos)
+    egresos_dia = np.array(egresos)
+    balance_dia = ingresos_dia - egresos_dia
 
     # Crear gráfico con subplots
     fig = make_subplots(
@@ -466,11 +812,7 @@ def grafico_evolucion_temporal(stats: Dict):
     )
 
     # Subplot 2: Balance acumulado
-    balance_acumulado = []
-    acum = 0
-    for bal in balance_dia:
-        acum += bal
-        balance_acumulado.append(acum)
+    balance_acumulado = np.cumsum(balance_dia)
 
     fig.add_trace(
         go.Scatter(
@@ -501,73 +843,106 @@ def grafico_evolucion_temporal(stats: Dict):
     fig.update_yaxes(title_text="Monto ($)", row=1, col=1)
     fig.update_yaxes(title_text="Balance Acumulado ($)", row=2, col=1)
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_dict()
 
 
-def grafico_comparacion_personas(session, fecha_inicio, fecha_fin, personas: List[str]):
-    """Gráfico comparativo entre personas"""
+def grafico_evolucion_temporal(stats: Dict):
+    """Gráfico de evolución temporal de ingresos y egresos"""
 
-    if len(personas) < 2:
-        st.info("Se necesitan al menos 2 personas para comparar")
+    transacciones_dia = stats['transacciones_por_dia']
+
+    if not transacciones_dia:
+        st.info("No hay datos temporales para mostrar")
         return
 
-    # Calcular stats por persona
-    datos_personas = []
+    # Preparar datos (tuplas para que sirvan como clave del cache)
+    fechas = tuple(sorted(transacciones_dia.keys()))
+    ingresos = tuple(transacciones_dia[f]["ingresos"] for f in fechas)
+    egresos = tuple(transacciones_dia[f]["egresos"] for f in fechas)
 
-    for persona in personas:
-        stats = calcular_estadisticas_por_persona(session, fecha_inicio, fecha_fin, persona)
-        datos_personas.append({
-            "Persona": persona,
-            "Ingresos": stats['total_ingresos'],
-            "Egresos": stats['total_egresos'],
-            "Balance": stats['balance'],
-            "Transacciones": stats['total_transacciones']
-        })
+    st.plotly_chart(figura_evolucion_temporal(fechas, ingresos, egresos), use_container_width=True)
 
-    df = pd.DataFrame(datos_personas)
 
-    # Crear subplots
-    fig = make_subplots(
-        rows=1, cols=3,
-        subplot_titles=("Ingresos por Persona", "Egresos por Persona", "Balance por Persona"),
-        specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "bar"}]]
-    )
+def grafico_comparacion_personas(totales: Dict):
+    """
+    Gráfico comparativo entre personas
 
-    # Ingresos
-    fig.add_trace(
-        go.Bar(name='Ingresos', x=df['Persona'], y=df['Ingresos'], marker_color='#00CC66'),
-        row=1, col=1
-    )
+    Args:
+        totales: Diccionario persona -> {"ingresos", "egresos", "cantidad"}
+    """
 
-    # Egresos
-    fig.add_trace(
-        go.Bar(name='Egresos', x=df['Persona'], y=df['Egresos'], marker_color='#FF4444'),
-        row=1, col=2
-    )
+    if len(totales) < 2:
+        st.info("Se necesitan al menos 2 personas para comparar")
+        return
 
-    # Balance
-    colors = ['#00CC66' if b > 0 else '#FF4444' for b in df['Balance']]
-    fig.add_trace(
-        go.Bar(name='Balance', x=df['Persona'], y=df['Balance'], marker_color=colors),
-        row=1, col=3
-    )
+    datos_personas = [
+        {
+            "Persona": persona,
+            "Ingresos": round(t["ingresos"], 2),
+            "Egresos": round(t["egresos"], 2),
+            "Balance": round(t["ingresos"] - t["egresos"], 2),
+            "Transacciones": t["cantidad"]
+        }
+        for persona, t in totales.items()
+    ]
 
-    fig.update_layout(height=400, showlegend=False, title_text="Comparación Multi-Persona")
+    df = pd.DataFrame(datos_personas)
 
-    st.plotly_chart(fig, use_container_width=True)
+    figura = figura_comparacion_personas(
+        tuple(df['Persona']),
+        tuple(df['Ingresos']),
+        tuple(df['Egresos']),
+        tuple(df['Balance'])
+    )
+    st.plotly_chart(figura, use_container_width=True)
 
     # Tabla comparativa
     st.subheader("📊 Tabla Comparativa Detallada")
 
     # Formatear tabla
     df_formatted = df.copy()
-    df_formatted['Ingresos'] = df_formatted['Ingresos'].apply(formatear_monto)
-    df_formatted['Egresos'] = df_formatted['Egresos'].apply(formatear_monto)
-    df_formatted['Balance'] = df_formatted['Balance'].apply(formatear_monto)
+    for columna in ('Ingresos', 'Egresos', 'Balance'):
+        df_formatted[columna] = formatear_montos(df_formatted[columna])
 
     st.dataframe(df_formatted, use_container_width=True, hide_index=True)
 
 
+@st.cache_data
+def figura_comparacion_personas(
+    personas: tuple,
+    ingresos: tuple,
+    egresos: tuple,
+    balances: tuple
+) -> Dict:
+    """Construye la figura comparativa entre personas (cacheada por datos)"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Crear subplots
+    fig = make_subplots(
+        rows=1, cols=3,
+        subplot_titles=("Ingresos por Persona", "Egresos por Persona", "Balance por Persona"),
+        specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "bar"}]]
+    )
+
+    colors = ['#00CC66' if b > 0 else '#FF4444' for b in balances]
+
+    # Ingresos, egresos y balance en una sola llamada (una validación del árbol)
+    fig.add_traces(
+        [
+            go.Bar(name='Ingresos', x=personas, y=ingresos, marker_color='#00CC66'),
+            go.Bar(name='Egresos', x=personas, y=egresos, marker_color='#FF4444'),
+            go.Bar(name='Balance', x=personas, y=balances, marker_color=colors)
+        ],
+        rows=[1, 1, 1],
+        cols=[1, 2, 3]
+    )
+
+    fig.update_layout(height=400, showlegend=False, title_text="Comparación Multi-Persona")
+
+    return fig.to_dict()
+
+
 def grafico_categorias_detallado(stats: Dict, tipo: str):
     """Gráfico detallado de categorías con ranking"""
 
@@ -580,95 +955,255 @@ def grafico_categorias_detallado(stats: Dict, tipo: str):
     # Ordenar por monto
     categorias_ordenadas = sorted(categorias.items(), key=lambda x: x[1], reverse=True)
 
-    cats = [c[0] for c in categorias_ordenadas]
-    montos = [c[1] for c in categorias_ordenadas]
+    cats = tuple(c[0] for c in categorias_ordenadas)
+    montos = tuple(c[1] for c in categorias_ordenadas)
 
-    # Calcular porcentajes
-    total = sum(montos)
-    porcentajes = [m/total*100 for m in montos]
+    fig_pie, fig_bar = figuras_categorias(tipo, cats, montos)
 
     # Crear dos columnas
     col1, col2 = st.columns([1, 1])
 
     with col1:
-        # Gráfico de torta
-        fig_pie = px.pie(
-            values=montos,
-            names=cats,
-            title=f"Distribución de {tipo.capitalize()}s",
-            color_discrete_sequence=px.colors.sequential.Greens if tipo == "ingreso" else px.colors.sequential.Reds
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig_pie, use_container_width=True)
 
     with col2:
-        # Gráfico de barras horizontales
-        fig_bar = go.Figure(go.Bar(
-            x=montos,
-            y=cats,
-            orientation='h',
-            marker_color='#00CC66' if tipo == "ingreso" else '#FF4444',
-            text=[f'{formatear_monto(m)} ({p:.1f}%)' for m, p in zip(montos, porcentajes)],
-            textposition='auto'
-        ))
-
-        fig_bar.update_layout(
-            title=f"Ranking de {tipo.capitalize()}s por Monto",
-            xaxis_title="Monto ($)",
-            yaxis_title="Categoría",
-            height=400
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+
+@st.cache_data
+def figuras_categorias(tipo: str, cats: tuple, montos: tuple) -> tuple:
+    """Construye la torta y el ranking de categorías (cacheados por datos)"""
+    import plotly.graph_objects as go
+    from plotly.colors import sequential
+
+    # Calcular porcentajes
+    total = sum(montos)
+    porcentajes = [m/total*100 for m in montos]
+
+    # Gráfico de torta: go.Pie recibe las listas directo, sin el DataFrame
+    # intermedio (ni la importación) de plotly.express
+    fig_pie = go.Figure(
+        go.Pie(
+            values=montos,
+            labels=cats,
+            hovertemplate='label=%{label}<br>value=%{value}<extra></extra>',
+            textposition='inside',
+            textinfo='percent+label'
+        ),
+        layout=dict(
+            title_text=f"Distribución de {tipo.capitalize()}s",
+            piecolorway=sequential.Greens if tipo == "ingreso" else sequential.Reds,
+            legend_tracegroupgap=0
         )
+    )
 
-        st.plotly_chart(fig_bar, use_container_width=True)
+    # Gráfico de barras horizontales
+    fig_bar = go.Figure(go.Bar(
+        x=montos,
+        y=cats,
+        orientation='h',
+        marker_color='#00CC66' if tipo == "ingreso" else '#FF4444',
+        text=[f'{formatear_monto(m)} ({p:.1f}%)' for m, p in zip(montos, porcentajes)],
+        textposition='auto'
+    ))
+
+    fig_bar.update_layout(
+        title=f"Ranking de {tipo.capitalize()}s por Monto",
+        xaxis_title="Monto ($)",
+        yaxis_title="Categoría",
+        height=400
+    )
 
+    return fig_pie.to_dict(), fig_bar.to_dict()
 
-def tabla_transacciones_completa(session, filtros: Dict):
-    """Tabla completa de transacciones con filtros"""
 
-    transacciones = obtener_transacciones(
-        session,
-        tipo=filtros.get('tipo'),
-        categoria=filtros.get('categoria'),
-        fecha_desde=filtros.get('fecha_desde'),
-        fecha_hasta=filtros.get('fecha_hasta'),
-        limite=200
+def filtros_consulta_transacciones(filtros: Dict) -> Dict:
+    """Extrae de los filtros del sidebar los que entiende la consulta de transacciones"""
+    return {
+        "tipo": filtros.get('tipo'),
+        "categoria": filtros.get('categoria'),
+        "fecha_desde": filtros.get('fecha_desde'),
+        "fecha_hasta": filtros.get('fecha_hasta')
+    }
+
+
+def dataframe_transacciones(transacciones, tipos_nativos: bool = False) -> pd.DataFrame:
+    """
+    Arma el DataFrame de la tabla de transacciones (monto sin formatear)
+
+    Args:
+        transacciones: Filas con las columnas de COLUMNAS_TABLA_TRANSACCIONES
+        tipos_nativos: Si True, deja Fecha como datetime y Tipo/Origen como
+            categóricas para que st.dataframe las formatee (en lugar de texto)
+
+    Returns:
+        DataFrame con los encabezados de la tabla
+    """
+    # Las filas de COLUMNAS_TABLA_TRANSACCIONES van directo al DataFrame,
+    # sin armar una tupla por fila; el formato se aplica por columna
+    df = pd.DataFrame.from_records(
+        transacciones,
+        columns=[columna.key for columna in COLUMNAS_TABLA_TRANSACCIONES]
     )
+    df = df[list(COLUMNAS_DATAFRAME_TRANSACCIONES)].rename(columns=COLUMNAS_DATAFRAME_TRANSACCIONES)
+
+    df["Tipo"] = df["Tipo"].map(VALORES_ENUM, na_action="ignore").str.upper()
+    df["Origen"] = df["Origen"].map(VALORES_ENUM, na_action="ignore").str.upper()
+    df["Fecha"] = pd.to_datetime(df["Fecha"])
+    df["Persona"] = df["Persona"].fillna("").replace("", "General")
+    df["Emisor/Receptor"] = df["Emisor/Receptor"].fillna("").str.slice(0, 30).replace("", "N/A")
+    df["Descripción"] = df["Descripción"].fillna("").str.slice(0, 50)
+
+    if tipos_nativos:
+        # Arrow las serializa como timestamp y diccionario (más liviano que texto)
+        df["Tipo"] = df["Tipo"].astype("category")
+        df["Origen"] = df["Origen"].astype("category")
+        return df
+
+    df["Fecha"] = df["Fecha"].dt.strftime('%Y-%m-%d %H:%M').fillna("N/A")
+    df["Tipo"] = df["Tipo"].fillna("N/A")
+    df["Origen"] = df["Origen"].fillna("N/A")
+
+    return df
+
+
+def paginas_transacciones(session, filtros: Dict, tamano_pagina: int = TAMANO_PAGINA_EXPORTACION):
+    """Recorre en la BD todas las transacciones filtradas, una página por consulta"""
+    offset = 0
+
+    while True:
+        filas = obtener_filas_transacciones(
+            session,
+            COLUMNAS_TABLA_TRANSACCIONES,
+            limite=tamano_pagina,
+            offset=offset,
+            **filtros_consulta_transacciones(filtros)
+        )
+
+        if not filas:
+            return
+
+        yield filas
+
+        if len(filas) < tamano_pagina:
+            return
+
+        offset += tamano_pagina
+
+
+def generar_exportaciones(db, filtros: Dict, total: int) -> Dict:
+    """
+    Arma los archivos de exportación del filtro actual
+
+    Args:
+        db: Base de datos (se abre una sesión corta solo para las consultas)
+        filtros: Filtros del sidebar
+        total: Cantidad real de transacciones del filtro (para el PDF)
+
+    Returns:
+        Dict con 'csv', 'excel' y 'pdf': el contenido en bytes, o el mensaje
+        de error (str) si ese formato no se pudo generar
+    """
+    from src.dashboard.export_utils import exportar_a_csv_paginado
+
+    archivos = {}
+
+    with db.get_session() as session:
+        # CSV (básico): todas las transacciones filtradas, página por página
+        archivos['csv'] = exportar_a_csv_paginado(
+            dataframe_transacciones(filas) for filas in paginas_transacciones(session, filtros)
+        ).getvalue()
+
+        # Excel y PDF se arman con las primeras transacciones del filtro
+        transacciones = obtener_filas_transacciones(
+            session,
+            COLUMNAS_TABLA_TRANSACCIONES,
+            limite=LIMITE_EXPORTACION,
+            **filtros_consulta_transacciones(filtros)
+        )
+
+    # Excel (con formato)
+    try:
+        from src.dashboard.export_utils import exportar_a_excel
+        archivos['excel'] = exportar_a_excel(transacciones).getvalue()
+    except ImportError:
+        archivos['excel'] = "⚠️ Falta instalar: `pip install openpyxl xlsxwriter`"
+    except Exception as e:
+        archivos['excel'] = f"❌ Error Excel: {str(e)}"
 
-    if not transacciones:
+    # PDF (con estadísticas)
+    try:
+        from src.dashboard.export_utils import exportar_a_pdf
+
+        # Calcular estadísticas para el PDF (el total es el del filtro, no
+        # el de las filas exportadas)
+        stats_pdf = {
+            'total_transacciones': total,
+            'total_ingresos': sum(t.monto for t in transacciones if hasattr(t, 'tipo') and t.tipo.value == 'ingreso'),
+            'total_egresos': sum(t.monto for t in transacciones if hasattr(t, 'tipo') and t.tipo.value == 'egreso'),
+            'balance': sum(t.monto if hasattr(t, 'tipo') and t.tipo.value == 'ingreso' else -t.monto for t in transacciones)
+        }
+
+        pdf_buffer = exportar_a_pdf(transacciones, stats_pdf)
+        archivos['pdf'] = pdf_buffer.getvalue() if pdf_buffer else "⚠️ No se pudo generar PDF"
+
+    except ImportError:
+        archivos['pdf'] = "⚠️ Falta instalar: `pip install reportlab`"
+    except Exception as e:
+        archivos['pdf'] = f"❌ Error PDF: {str(e)}"
+
+    return archivos
+
+
+def tabla_transacciones_completa(db, filtros: Dict, resumen: Dict):
+    """
+    Tabla completa de transacciones con filtros
+
+    Args:
+        db: Base de datos (se abre una sesión corta solo para las consultas)
+        filtros: Filtros del sidebar
+        resumen: Conteos del filtro (total, personas, categorías)
+    """
+
+    if not resumen['total']:
         st.info("No hay transacciones para mostrar")
         return
 
-    # Convertir a DataFrame
-    data = []
-    for t in transacciones:
-        data.append({
-            "ID": t.id,
-            "Fecha": t.fecha_transaccion.strftime('%Y-%m-%d %H:%M') if t.fecha_transaccion else "N/A",
-            "Persona": t.persona or "General",
-            "Tipo": t.tipo.value.upper() if t.tipo else "N/A",
-            "Categoría": t.categoria,
-            "Monto": t.monto,
-            "Emisor/Receptor": t.emisor_receptor[:30] if t.emisor_receptor else "N/A",
-            "Descripción": t.descripcion[:50] if t.descripcion else "",
-            "Origen": t.origen.value.upper() if t.origen else "N/A"
-        })
-
-    df = pd.DataFrame(data)
-
-    # Formatear monto para display
-    df_display = df.copy()
-    df_display['Monto'] = df_display['Monto'].apply(formatear_monto)
-
     # Mostrar estadísticas rápidas
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Registros", len(df))
+        st.metric("Total Registros", resumen['total'])
     with col2:
-        personas_unicas = df['Persona'].nunique()
-        st.metric("Personas", personas_unicas)
+        st.metric("Personas", resumen['personas'])
     with col3:
-        categorias_unicas = df['Categoría'].nunique()
-        st.metric("Categorías", categorias_unicas)
+        st.metric("Categorías", resumen['categorias'])
+
+    # Paginación en la BD: solo se traen las filas de la página visible
+    total_paginas = -(-resumen['total'] // TAMANO_PAGINA_TABLA)
+    pagina = st.number_input(
+        f"Página (de {total_paginas})",
+        min_value=1,
+        max_value=total_paginas,
+        value=1,
+        step=1
+    )
+
+    filtros_consulta = filtros_consulta_transacciones(filtros)
+
+    # Solo la página visible, en una sesión corta; lo que sigue dibuja con
+    # filas ya materializadas
+    with db.get_session() as session:
+        # Filas livianas con solo las columnas necesarias (sin objetos ORM)
+        filas_pagina = obtener_filas_transacciones(
+            session,
+            COLUMNAS_TABLA_TRANSACCIONES,
+            limite=TAMANO_PAGINA_TABLA,
+            offset=(int(pagina) - 1) * TAMANO_PAGINA_TABLA,
+            **filtros_consulta
+        )
+
+    # El monto queda numérico: lo formatea el grid de Streamlit (y ordena bien)
+    df_display = dataframe_transacciones(filas_pagina, tipos_nativos=True)
 
     # Tabla interactiva
     st.dataframe(
@@ -676,74 +1211,71 @@ def tabla_transacciones_completa(session, filtros: Dict):
         use_container_width=True,
         hide_index=True,
         column_config={
-            "Monto": st.column_config.TextColumn("Monto", help="Monto de la transacción"),
-            "Tipo": st.column_config.TextColumn("Tipo", help="Ingreso o Egreso")
+            "Fecha": st.column_config.DatetimeColumn("Fecha", format="YYYY-MM-DD HH:mm"),
+            "Monto": st.column_config.NumberColumn("Monto", help="Monto de la transacción", format="$%.2f"),
+            "Tipo": st.column_config.Column("Tipo", help="Ingreso o Egreso")
         }
     )
 
-    # Opciones de exportación
+    # Opciones de exportación. Los archivos recorren todo el filtro, así que
+    # se arman solo a pedido y se guardan para los reruns del mismo filtro
     st.markdown("### 📥 Exportar Datos")
 
+    # El total y la última modificación del filtro cambian con las altas,
+    # bajas y ediciones (también las hechas desde otro proceso)
+    clave_exportacion = (
+        *filtros_consulta.values(),
+        resumen['total'],
+        resumen['ultima_modificacion']
+    )
+    exportacion = st.session_state.get("exportacion_transacciones")
+
+    if exportacion is None or exportacion[0] != clave_exportacion:
+        if not st.button("⚙️ Preparar exportación", use_container_width=True):
+            return
+
+        with st.spinner("Generando archivos..."):
+            archivos = generar_exportaciones(db, filtros, resumen['total'])
+        exportacion = (clave_exportacion, archivos)
+        st.session_state["exportacion_transacciones"] = exportacion
+
+    archivos = exportacion[1]
+    sufijo = datetime.now().strftime("%Y%m%d_%H%M%S")
+
     col_exp1, col_exp2, col_exp3 = st.columns(3)
 
     with col_exp1:
-        # CSV (básico)
-        csv = df.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="📄 Descargar CSV",
-            data=csv,
-            file_name=f'transacciones_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+            data=archivos['csv'],
+            file_name=f'transacciones_{sufijo}.csv',
             mime='text/csv',
             use_container_width=True
         )
 
     with col_exp2:
-        # Excel (con formato)
-        try:
-            from src.dashboard.export_utils import exportar_a_excel
-            excel_buffer = exportar_a_excel(transacciones)
+        if isinstance(archivos['excel'], str):
+            st.error(archivos['excel'])
+        else:
             st.download_button(
                 label="📊 Descargar Excel",
-                data=excel_buffer,
-                file_name=f'transacciones_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
+                data=archivos['excel'],
+                file_name=f'transacciones_{sufijo}.xlsx',
                 mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                 use_container_width=True
             )
-        except ImportError as e:
-            st.error(f"⚠️ Falta instalar: `pip install openpyxl xlsxwriter`")
-        except Exception as e:
-            st.error(f"❌ Error Excel: {str(e)}")
 
     with col_exp3:
-        # PDF (con estadísticas)
-        try:
-            from src.dashboard.export_utils import exportar_a_pdf
-
-            # Calcular estadísticas para el PDF
-            stats_pdf = {
-                'total_transacciones': len(transacciones),
-                'total_ingresos': sum(t.monto for t in transacciones if hasattr(t, 'tipo') and t.tipo.value == 'ingreso'),
-                'total_egresos': sum(t.monto for t in transacciones if hasattr(t, 'tipo') and t.tipo.value == 'egreso'),
-                'balance': sum(t.monto if hasattr(t, 'tipo') and t.tipo.value == 'ingreso' else -t.monto for t in transacciones)
-            }
-
-            pdf_buffer = exportar_a_pdf(transacciones, stats_pdf)
-
-            if pdf_buffer:
-                st.download_button(
-                    label="📕 Descargar PDF",
-                    data=pdf_buffer,
-                    file_name=f'transacciones_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
-                    mime='application/pdf',
-                    use_container_width=True
-                )
-            else:
-                st.error("⚠️ No se pudo generar PDF")
-
-        except ImportError as e:
-            st.error(f"⚠️ Falta instalar: `pip install reportlab`")
-        except Exception as e:
-            st.error(f"❌ Error PDF: {str(e)}")
+        if isinstance(archivos['pdf'], str):
+            st.error(archivos['pdf'])
+        else:
+            st.download_button(
+                label="📕 Descargar PDF",
+                data=archivos['pdf'],
+                file_name=f'transacciones_{sufijo}.pdf',
+                mime='application/pdf',
+                use_container_width=True
+            )
 
 
 # ==================== SIDEBAR Y FILTROS ====================
@@ -756,7 +1288,7 @@ def filtros_sidebar(session):
 
     # === FILTRO DE PERSONA ===
     st.sidebar.subheader("👤 Persona")
-    personas = obtener_personas_unicas(session)
+    personas = obtener_personas_cacheadas(session)
     personas_opciones = ["Todas"] + personas
 
     persona_seleccionada = st.sidebar.selectbox(
@@ -786,8 +1318,8 @@ def filtros_sidebar(session):
         index=3  # Default: Últimos 30 días
     )
 
-    # Calcular fechas
-    hoy = datetime.now()
+    # Calcular fechas (al minuto, para que los filtros sirvan como clave de cache)
+    hoy = datetime.now().replace(second=0, microsecond=0)
 
     if periodo == "Personalizado":
         fecha_desde = st.sidebar.date_input(
@@ -861,6 +1393,8 @@ def filtros_sidebar(session):
 
     # Botón de refrescar
     if st.sidebar.button("🔄 Refrescar Dashboard", use_container_width=True):
+        st.cache_data.clear()
+        st.session_state.pop("exportacion_transacciones", None)
         st.rerun()
 
     return {
@@ -896,157 +1430,169 @@ def main():
         st.error("❌ Error de conexión a la base de datos")
         st.stop()
 
-    # Obtener filtros
+    # Obtener filtros y cargar los datos con una sola sesión; al salir del
+    # bloque la sesión queda cerrada y el resto solo dibuja valores ya calculados
     with db.get_session() as session:
         filtros = filtros_sidebar(session)
 
         # ==================== ANÁLISIS PRINCIPAL ====================
 
-        # Calcular estadísticas del período actual
-        stats_actual = calcular_estadisticas_por_persona(
-            session,
-            filtros['fecha_desde'],
-            filtros['fecha_hasta'],
-            filtros['persona']
-        )
-
-        # Calcular estadísticas del período anterior (para comparación)
+        # Período anterior de igual duración (para comparación)
         dias_periodo = (filtros['fecha_hasta'] - filtros['fecha_desde']).days
         fecha_desde_anterior = filtros['fecha_desde'] - timedelta(days=dias_periodo)
         fecha_hasta_anterior = filtros['fecha_desde'] - timedelta(seconds=1)
 
-        stats_anterior = calcular_estadisticas_por_persona(
+        # Calcular estadísticas del período actual y del anterior en una consulta
+        stats_actual, stats_anterior = obtener_estadisticas_comparadas_cacheadas(
             session,
-            fecha_desde_anterior,
-            fecha_hasta_anterior,
-            filtros['persona']
+            filtros['persona'],
+            filtros['fecha_desde'].isoformat(),
+            filtros['fecha_hasta'].isoformat(),
+            fecha_desde_anterior.isoformat(),
+            fecha_hasta_anterior.isoformat()
         )
 
-        # Calcular ratios financieros
-        ratios = calcular_ratios_financieros(stats_actual, stats_anterior)
+        # Datos de la comparación por persona (solo si se va a mostrar)
+        comparar = filtros['comparar_personas'] or len(filtros['personas_list']) > 1
+        totales_personas = stats_personas = None
 
-        # ==================== HEADER CON INFO DEL FILTRO ====================
+        if comparar:
+            totales_personas = obtener_totales_personas_cacheados(
+                session,
+                tuple(filtros['personas_list']),
+                filtros['fecha_desde'].isoformat(),
+                filtros['fecha_hasta'].isoformat()
+            )
 
-        if filtros['persona'] and filtros['persona'] != "Todas":
-            st.info(f"👤 Mostrando datos para: **{filtros['persona']}**")
-        elif filtros['comparar_personas']:
-            st.info(f"👥 Modo comparación: Analizando {len(filtros['personas_list'])} personas")
-        else:
-            st.info("📊 Mostrando datos consolidados de todas las personas")
+            # Todas las personas en una sola consulta agrupada
+            stats_personas = obtener_estadisticas_personas_cacheadas(
+                session,
+                tuple(filtros['personas_list']),
+                filtros['fecha_desde'].isoformat(),
+                filtros['fecha_hasta'].isoformat()
+            )
 
-        # ==================== KPIS PRINCIPALES ====================
+        # Conteos de la tabla de transacciones (definen la paginación)
+        filtros_consulta = filtros_consulta_transacciones(filtros)
+        resumen_tabla = contar_transacciones_cacheado(
+            session,
+            filtros_consulta['tipo'],
+            filtros_consulta['categoria'],
+            filtros_consulta['fecha_desde'].isoformat() if filtros_consulta['fecha_desde'] else None,
+            filtros_consulta['fecha_hasta'].isoformat() if filtros_consulta['fecha_hasta'] else None
+        )
 
-        st.header("📊 KPIs Principales")
-        mostrar_kpis_profesionales(stats_actual, ratios)
+    # Calcular ratios financieros
+    ratios = calcular_ratios_financieros(stats_actual, stats_anterior)
 
-        st.markdown("---")
+    # ==================== HEADER CON INFO DEL FILTRO ====================
 
-        # ==================== RATIOS FINANCIEROS ====================
+    if filtros['persona'] and filtros['persona'] != "Todas":
+        st.info(f"👤 Mostrando datos para: **{filtros['persona']}**")
+    elif filtros['comparar_personas']:
+        st.info(f"👥 Modo comparación: Analizando {len(filtros['personas_list'])} personas")
+    else:
+        st.info("📊 Mostrando datos consolidados de todas las personas")
 
-        if filtros['mostrar_ratios']:
-            mostrar_ratios_financieros(ratios)
-            st.markdown("---")
+    # ==================== KPIS PRINCIPALES ====================
+
+    st.header("📊 KPIs Principales")
+    mostrar_kpis_profesionales(stats_actual, ratios)
 
-        # ==================== TABS DE ANÁLISIS ====================
-
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "📈 Evolución Temporal",
-            "🏷️ Análisis por Categorías",
-            "👥 Comparación por Persona",
-            "📋 Transacciones Detalladas"
-        ])
-
-        # === TAB 1: EVOLUCIÓN TEMPORAL ===
-        with tab1:
-            st.subheader("📈 Evolución Temporal del Flujo de Caja")
-            grafico_evolucion_temporal(stats_actual)
-
-            # Estadísticas adicionales
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("**📊 Estadísticas del Período**")
-                st.write(f"• Días totales: {stats_actual['dias_periodo']}")
-                st.write(f"• Días con actividad: {stats_actual['dias_con_datos']}")
-                st.write(f"• Promedio ingresos/día: {formatear_monto(stats_actual['promedio_ingreso_dia'])}")
-                st.write(f"• Promedio egresos/día: {formatear_monto(stats_actual['promedio_egreso_dia'])}")
-
-            with col2:
-                st.markdown("**🎯 Proyecciones**")
-                if ratios['dias_hasta_cero']:
-                    st.warning(f"⏱️ Con el gasto actual, el balance llegará a cero en **{ratios['dias_hasta_cero']} días**")
-                else:
-                    st.success("✅ El balance actual es sostenible con el flujo de ingresos")
-
-                # Proyección mensual
-                ingresos_proyectados = stats_actual['promedio_ingreso_dia'] * 30
-                egresos_proyectados = stats_actual['promedio_egreso_dia'] * 30
-                balance_proyectado = ingresos_proyectados - egresos_proyectados
-
-                st.write(f"• Proyección ingresos mes: {formatear_monto(ingresos_proyectados)}")
-                st.write(f"• Proyección egresos mes: {formatear_monto(egresos_proyectados)}")
-                st.write(f"• Balance proyectado mes: {formatear_monto(balance_proyectado)}")
-
-        # === TAB 2: CATEGORÍAS ===
-        with tab2:
-            st.subheader("🏷️ Análisis Detallado por Categorías")
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown("### 💵 Ingresos")
-                grafico_categorias_detallado(stats_actual, "ingreso")
-
-            with col2:
-                st.markdown("### 💸 Egresos")
-                grafico_categorias_detallado(stats_actual, "egreso")
-
-        # === TAB 3: COMPARACIÓN PERSONAS ===
-        with tab3:
-            st.subheader("👥 Comparación Multi-Persona")
-
-            if filtros['comparar_personas'] or len(filtros['personas_list']) > 1:
-                grafico_comparacion_personas(
-                    session,
-                    filtros['fecha_desde'],
-                    filtros['fecha_hasta'],
-                    filtros['personas_list']
-                )
-
-                # Análisis individual por persona
-                st.markdown("---")
-                st.subheader("📊 Análisis Individual por Persona")
-
-                for persona in filtros['personas_list']:
-                    with st.expander(f"👤 {persona}"):
-                        stats_persona = calcular_estadisticas_por_persona(
-                            session,
-                            filtros['fecha_desde'],
-                            filtros['fecha_hasta'],
-                            persona
-                        )
-
-                        col1, col2, col3 = st.columns(3)
-
-                        with col1:
-                            st.metric("Ingresos", formatear_monto(stats_persona['total_ingresos']))
-                        with col2:
-                            st.metric("Egresos", formatear_monto(stats_persona['total_egresos']))
-                        with col3:
-                            st.metric("Balance", formatear_monto(stats_persona['balance']))
-
-                        # Top 3 categorías
-                        if stats_persona['categorias_egresos']:
-                            st.markdown("**Top 3 Egresos:**")
-                            top_egresos = sorted(stats_persona['categorias_egresos'].items(), key=lambda x: x[1], reverse=True)[:3]
-                            for idx, (cat, monto) in enumerate(top_egresos, 1):
-                                st.write(f"{idx}. {cat}: {formatear_monto(monto)}")
+    st.markdown("---")
+
+    # ==================== RATIOS FINANCIEROS ====================
+
+    if filtros['mostrar_ratios']:
+        mostrar_ratios_financieros(ratios)
+        st.markdown("---")
+
+    # ==================== TABS DE ANÁLISIS ====================
+
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "📈 Evolución Temporal",
+        "🏷️ Análisis por Categorías",
+        "👥 Comparación por Persona",
+        "📋 Transacciones Detalladas"
+    ])
+
+    # === TAB 1: EVOLUCIÓN TEMPORAL ===
+    with tab1:
+        st.subheader("📈 Evolución Temporal del Flujo de Caja")
+        grafico_evolucion_temporal(stats_actual)
+
+        # Estadísticas adicionales
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**📊 Estadísticas del Período**")
+            st.write(f"• Días totales: {stats_actual['dias_periodo']}")
+            st.write(f"• Días con actividad: {stats_actual['dias_con_datos']}")
+            st.write(f"• Promedio ingresos/día: {formatear_monto(stats_actual['promedio_ingreso_dia'])}")
+            st.write(f"• Promedio egresos/día: {formatear_monto(stats_actual['promedio_egreso_dia'])}")
+
+        with col2:
+            st.markdown("**🎯 Proyecciones**")
+            if ratios['dias_hasta_cero']:
+                st.warning(f"⏱️ Con el gasto actual, el balance llegará a cero en **{ratios['dias_hasta_cero']} días**")
             else:
-                st.info("Activa la opción 'Comparar todas las personas' en el panel de control para ver este análisis")
+                st.success("✅ El balance actual es sostenible con el flujo de ingresos")
+
+            # Proyección mensual
+            st.write(f"• Proyección ingresos mes: {formatear_monto(ratios['ingresos_proyectados_mes'])}")
+            st.write(f"• Proyección egresos mes: {formatear_monto(ratios['egresos_proyectados_mes'])}")
+            st.write(f"• Balance proyectado mes: {formatear_monto(ratios['balance_proyectado_mes'])}")
+
+    # === TAB 2: CATEGORÍAS ===
+    with tab2:
+        st.subheader("🏷️ Análisis Detallado por Categorías")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("### 💵 Ingresos")
+            grafico_categorias_detallado(stats_actual, "ingreso")
+
+        with col2:
+            st.markdown("### 💸 Egresos")
+            grafico_categorias_detallado(stats_actual, "egreso")
+
+    # === TAB 3: COMPARACIÓN PERSONAS ===
+    with tab3:
+        st.subheader("👥 Comparación Multi-Persona")
+
+        if comparar:
+            grafico_comparacion_personas(totales_personas)
+
+            # Análisis individual por persona
+            st.markdown("---")
+            st.subheader("📊 Análisis Individual por Persona")
+
+            for persona in filtros['personas_list']:
+                with st.expander(f"👤 {persona}"):
+                    stats_persona = stats_personas[persona]
+
+                    col1, col2, col3 = st.columns(3)
+
+                    with col1:
+                        st.metric("Ingresos", formatear_monto(stats_persona['total_ingresos']))
+                    with col2:
+                        st.metric("Egresos", formatear_monto(stats_persona['total_egresos']))
+                    with col3:
+                        st.metric("Balance", formatear_monto(stats_persona['balance']))
+
+                    # Top 3 categorías
+                    if stats_persona['categorias_egresos']:
+                        st.markdown("**Top 3 Egresos:**")
+                        top_egresos = nlargest(3, stats_persona['categorias_egresos'].items(), key=itemgetter(1))
+                        for idx, (cat, monto) in enumerate(top_egresos, 1):
+                            st.write(f"{idx}. {cat}: {formatear_monto(monto)}")
+        else:
+            st.info("Activa la opción 'Comparar todas las personas' en el panel de control para ver este análisis")
 
-        # === TAB 4: TRANSACCIONES ===
-        with tab4:
-            st.subheader("📋 Listado Completo de Transacciones")
-            tabla_transacciones_completa(session, filtros)
+    # === TAB 4: TRANSACCIONES ===
+    with tab4:
+        st.subheader("📋 Listado Completo de Transacciones")
+        tabla_transacciones_completa(db, filtros, resumen_tabla)
 
     # ==================== FOOTER ====================
 
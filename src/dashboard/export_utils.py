@@ -4,120 +4,262 @@ Exporta transacciones a Excel y PDF con formato profesional
 """
 import pandas as pd
 from datetime import datetime
-from io import BytesIO
-from typing import List, Dict
+from functools import lru_cache
+from io import BytesIO, TextIOWrapper
+from operator import attrgetter
+from typing import List, Dict, Iterable
 import sys
 
 
+# Atributos de Transaccion que usan las exportaciones
+COLUMNAS_EXPORTACION = (
+    "id", "fecha_transaccion", "tipo", "categoria", "monto", "persona",
+    "emisor_receptor", "descripcion", "numero_comprobante", "origen",
+    "procesado_por_ia", "requiere_revision", "editado_manualmente"
+)
+
+# Subconjunto para la exportación simple (CSV): sin origen ni flags
+COLUMNAS_EXPORTACION_SIMPLE = COLUMNAS_EXPORTACION[:9]
+
+
+def _columnas_transacciones(transacciones: List, columnas: tuple = COLUMNAS_EXPORTACION) -> pd.DataFrame:
+    """
+    Extrae los atributos de las transacciones en un DataFrame crudo
+
+    Una tupla por transacción (sin armar un dict por fila); el formateo
+    posterior se hace por columna.
+
+    Args:
+        transacciones: Lista de objetos Transaccion o filas con esos atributos
+        columnas: Atributos a extraer
+
+    Returns:
+        DataFrame con una columna por atributo
+    """
+    obtener = attrgetter(*columnas)
+    return pd.DataFrame.from_records(
+        [obtener(t) for t in transacciones],
+        columns=list(columnas)
+    )
+
+
+def _texto(columna: pd.Series) -> pd.Series:
+    """Columna de texto con vacíos en lugar de None"""
+    return columna.fillna("").astype(str)
+
+
+def _valor_enum(columna: pd.Series) -> pd.Series:
+    """
+    Valor en mayúsculas de una columna de enums (vacío si falta)
+
+    Los enums distintos son pocos: se formatea cada uno una vez y la
+    columna se traduce con un diccionario.
+    """
+    valores = {miembro: miembro.value.upper() for miembro in columna.dropna().unique()}
+    return columna.map(valores).fillna("")
+
+
+def _si_no(columna: pd.Series) -> pd.Series:
+    """Columna booleana como Sí/No"""
+    return columna.map({True: "Sí"}).fillna("No")
+
+
+def _dataframe_exportacion(transacciones: List, completo: bool = True) -> pd.DataFrame:
+    """
+    Arma el DataFrame de exportación formateando por columna
+
+    Args:
+        transacciones: Lista de objetos Transaccion
+        completo: Si incluye origen y flags de procesamiento (Excel)
+
+    Returns:
+        DataFrame con los encabezados de la exportación
+    """
+    crudo = _columnas_transacciones(
+        transacciones,
+        COLUMNAS_EXPORTACION if completo else COLUMNAS_EXPORTACION_SIMPLE
+    )
+
+    df = pd.DataFrame({
+        "ID": crudo["id"],
+        "Fecha": pd.to_datetime(crudo["fecha_transaccion"]).dt.strftime('%Y-%m-%d').fillna(""),
+        "Tipo": _valor_enum(crudo["tipo"]),
+        "Categoría": _texto(crudo["categoria"]),
+        "Monto": crudo["monto"].fillna(0).astype(float),
+        "Persona": _texto(crudo["persona"]).replace("", "General"),
+        "Emisor/Receptor": _texto(crudo["emisor_receptor"]),
+        "Descripción": _texto(crudo["descripcion"]),
+        "Número Comprobante": _texto(crudo["numero_comprobante"])
+    })
+
+    if completo:
+        df["Origen"] = _valor_enum(crudo["origen"])
+        df["Procesado por IA"] = _si_no(crudo["procesado_por_ia"])
+        df["Requiere Revisión"] = _si_no(crudo["requiere_revision"])
+        df["Editado Manualmente"] = _si_no(crudo["editado_manualmente"])
+
+    return df
+
+
+# Ancho de cada columna del Excel (A..M)
+ANCHOS_COLUMNAS_EXCEL = {
+    'A': 8, 'B': 12, 'C': 10, 'D': 20, 'E': 15,
+    'F': 15, 'G': 25, 'H': 30, 'I': 20, 'J': 12,
+    'K': 15, 'L': 18, 'M': 18
+}
+
+
 def exportar_a_excel(transacciones: List, nombre_archivo: str = None) -> BytesIO:
     """
     Exporta transacciones a Excel con formato profesional
 
+    Usa xlsxwriter en modo constant_memory (cada fila se vuelca al pasar a
+    la siguiente); si no está instalado, recurre a openpyxl.
+
     Args:
         transacciones: Lista de objetos Transaccion
         nombre_archivo: Nombre base del archivo (opcional)
 
+    Returns:
+        BytesIO con el archivo Excel
+    """
+    try:
+        import xlsxwriter
+    except ImportError:
+        return _exportar_a_excel_openpyxl(transacciones)
+
+    # Crear DataFrame (extracción y formato por columna)
+    df = _dataframe_exportacion(transacciones)
+
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    worksheet = workbook.add_worksheet("Transacciones")
+
+    # Formatos
+    title_fmt = workbook.add_format({
+        'bold': True, 'font_size': 16, 'font_color': '#00CC66',
+        'align': 'center', 'valign': 'vcenter'
+    })
+    header_fmt = workbook.add_format({
+        'bold': True, 'font_size': 12, 'font_color': '#FFFFFF', 'bg_color': '#00CC66',
+        'align': 'center', 'valign': 'vcenter', 'border': 1
+    })
+    cell_fmt = workbook.add_format({'border': 1})
+    money_fmt = workbook.add_format({'border': 1, 'num_format': '$#,##0.00', 'align': 'right'})
+
+    # Ajustar ancho de columnas
+    for col, width in ANCHOS_COLUMNAS_EXCEL.items():
+        worksheet.set_column(f"{col}:{col}", width)
+
+    # Agregar título y metadata (en constant_memory las filas van en orden)
+    worksheet.merge_range('A1:M1', "FacturIA 2.1.0 - Reporte de Transacciones", title_fmt)
+    worksheet.write(1, 0, f"Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    worksheet.write(2, 0, f"Total de transacciones: {len(df)}")
+
+    # Agregar headers (fila 5)
+    worksheet.write_row(4, 0, list(df.columns), header_fmt)
+
+    # Agregar datos (formato especial para la columna Monto)
+    col_monto = df.columns.get_loc("Monto")
+
+    for row_idx, row_data in enumerate(df.itertuples(index=False, name=None), start=5):
+        worksheet.write_row(row_idx, 0, row_data[:col_monto], cell_fmt)
+        worksheet.write_number(row_idx, col_monto, row_data[col_monto], money_fmt)
+        worksheet.write_row(row_idx, col_monto + 1, row_data[col_monto + 1:], cell_fmt)
+
+    # Agregar filtros
+    worksheet.autofilter(4, 0, len(df) + 4, len(df.columns) - 1)
+
+    workbook.close()
+    output.seek(0)
+
+    return output
+
+
+def _exportar_a_excel_openpyxl(transacciones: List) -> BytesIO:
+    """
+    Exporta transacciones a Excel con openpyxl (alternativa sin xlsxwriter)
+
+    Args:
+        transacciones: Lista de objetos Transaccion
+
     Returns:
         BytesIO con el archivo Excel
     """
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils.dataframe import dataframe_to_rows
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
     except ImportError:
         # Fallback: exportar como CSV sin formato
         return exportar_a_csv(transacciones)
 
-    # Helper para limpiar strings con encoding
-    def safe_str(value):
-        """Convierte valor a string seguro manejando encoding"""
-        if value is None:
-            return ""
-        try:
-            return str(value)
-        except:
-            return ""
-
-    # Crear DataFrame
-    data = []
-    for t in transacciones:
-        data.append({
-            "ID": t.id,
-            "Fecha": t.fecha_transaccion.strftime('%Y-%m-%d') if t.fecha_transaccion else "",
-            "Tipo": safe_str(t.tipo.value.upper() if t.tipo else ""),
-            "Categoría": safe_str(t.categoria or ""),
-            "Monto": float(t.monto) if t.monto else 0,
-            "Persona": safe_str(t.persona or "General"),
-            "Emisor/Receptor": safe_str(t.emisor_receptor or ""),
-            "Descripción": safe_str(t.descripcion or ""),
-            "Número Comprobante": safe_str(t.numero_comprobante or ""),
-            "Origen": safe_str(t.origen.value.upper() if hasattr(t, 'origen') and t.origen else ""),
-            "Procesado por IA": "Sí" if t.procesado_por_ia else "No",
-            "Requiere Revisión": "Sí" if t.requiere_revision else "No",
-            "Editado Manualmente": "Sí" if t.editado_manualmente else "No"
-        })
-
-    df = pd.DataFrame(data)
-
-    # Crear workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Transacciones"
-
-    # Estilos
-    header_fill = PatternFill(start_color="00CC66", end_color="00CC66", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
+    # Crear DataFrame (extracción y formato por columna)
+    df = _dataframe_exportacion(transacciones)
+
+    # Crear workbook en modo streaming: las filas se escriben a medida
+    # que se agregan, sin mantener un objeto Cell por celda en memoria
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Transacciones")
+
+    # Estilos (registrados una sola vez en el libro)
     border = Border(
         left=Side(style='thin'),
         right=Side(style='thin'),
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
+    estilo_encabezado = NamedStyle(
+        name="encabezado",
+        fill=PatternFill(start_color="00CC66", end_color="00CC66", fill_type="solid"),
+        font=Font(bold=True, color="FFFFFF", size=12),
+        alignment=Alignment(horizontal='center', vertical='center'),
+        border=border
+    )
+    estilo_celda = NamedStyle(name="celda", border=border)
+    estilo_monto = NamedStyle(
+        name="monto",
+        border=border,
+        number_format='$#,##0.00',
+        alignment=Alignment(horizontal='right')
+    )
+
+    for estilo in (estilo_encabezado, estilo_celda, estilo_monto):
+        wb.add_named_style(estilo)
+
+    def celda(valor, estilo: str):
+        """Celda con un estilo ya registrado"""
+        c = WriteOnlyCell(ws, value=valor)
+        c.style = estilo
+        return c
+
+    # Ajustar ancho de columnas (en modo streaming, antes de escribir filas)
+    for col, width in ANCHOS_COLUMNAS_EXCEL.items():
+        ws.column_dimensions[col].width = width
 
     # Agregar título
-    ws.merge_cells('A1:M1')
-    title_cell = ws['A1']
-    title_cell.value = "FacturIA 2.1.0 - Reporte de Transacciones"
+    title_cell = WriteOnlyCell(ws, value="FacturIA 2.1.0 - Reporte de Transacciones")
     title_cell.font = Font(bold=True, size=16, color="00CC66")
     title_cell.alignment = Alignment(horizontal='center', vertical='center')
+    ws.append([title_cell])
+    ws.merged_cells.add('A1:M1')
 
     # Agregar metadata
-    ws['A2'] = f"Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ws['A3'] = f"Total de transacciones: {len(transacciones)}"
+    ws.append([f"Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+    ws.append([f"Total de transacciones: {len(df)}"])
+    ws.append([])
 
     # Agregar headers (fila 5)
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        cell = ws.cell(row=5, column=col_idx)
-        cell.value = col_name
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = border
-
-    # Agregar datos
-    for row_idx, row_data in enumerate(dataframe_to_rows(df, index=False, header=False), start=6):
-        for col_idx, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.value = value
-            cell.border = border
-
-            # Formato especial para montos
-            if col_idx == 5:  # Columna Monto
-                cell.number_format = '$#,##0.00'
-                cell.alignment = Alignment(horizontal='right')
+    ws.append([celda(col_name, "encabezado") for col_name in df.columns])
 
-    # Ajustar ancho de columnas
-    column_widths = {
-        'A': 8, 'B': 12, 'C': 10, 'D': 20, 'E': 15,
-        'F': 15, 'G': 25, 'H': 30, 'I': 20, 'J': 12,
-        'K': 15, 'L': 18, 'M': 18
-    }
+    # Agregar datos (formato especial para la columna Monto)
+    estilos_columnas = ["monto" if col_name == "Monto" else "celda" for col_name in df.columns]
 
-    for col, width in column_widths.items():
-        ws.column_dimensions[col].width = width
+    for row_data in df.itertuples(index=False, name=None):
+        ws.append([celda(value, estilo) for value, estilo in zip(row_data, estilos_columnas)])
 
     # Agregar filtros
-    ws.auto_filter.ref = f"A5:M{len(transacciones) + 5}"
+    ws.auto_filter.ref = f"A5:M{len(df) + 5}"
 
     # Guardar en BytesIO
     output = BytesIO()
@@ -137,21 +279,7 @@ def exportar_a_csv(transacciones: List) -> BytesIO:
     Returns:
         BytesIO con el archivo CSV
     """
-    data = []
-    for t in transacciones:
-        data.append({
-            "ID": t.id,
-            "Fecha": t.fecha_transaccion.strftime('%Y-%m-%d') if t.fecha_transaccion else "",
-            "Tipo": t.tipo.value.upper() if t.tipo else "",
-            "Categoría": t.categoria or "",
-            "Monto": float(t.monto) if t.monto else 0,
-            "Persona": t.persona or "General",
-            "Emisor/Receptor": t.emisor_receptor or "",
-            "Descripción": t.descripcion or "",
-            "Número Comprobante": t.numero_comprobante or ""
-        })
-
-    df = pd.DataFrame(data)
+    df = _dataframe_exportacion(transacciones, completo=False)
 
     output = BytesIO()
     df.to_csv(output, index=False, encoding='utf-8')
@@ -160,6 +288,99 @@ def exportar_a_csv(transacciones: List) -> BytesIO:
     return output
 
 
+def exportar_a_csv_paginado(paginas: Iterable[pd.DataFrame]) -> BytesIO:
+    """
+    Exporta a CSV escribiendo página por página
+
+    Solo una página de datos está en memoria a la vez; pandas escribe cada
+    página directo sobre el buffer (ya codificada), sin armar el texto
+    intermedio de la página.
+
+    Args:
+        paginas: Iterable de DataFrames con las mismas columnas
+
+    Returns:
+        BytesIO con el archivo CSV
+    """
+    output = BytesIO()
+    texto = TextIOWrapper(output, encoding='utf-8', newline='')
+    primera = True
+
+    for df in paginas:
+        df.to_csv(texto, index=False, header=primera)
+        primera = False
+
+    # Vaciar el wrapper y soltarlo sin cerrar el BytesIO
+    texto.flush()
+    texto.detach()
+    output.seek(0)
+
+    return output
+
+
+@lru_cache(maxsize=1)
+def _estilos_pdf() -> Dict:
+    """
+    Estilos de párrafo y tabla del reporte PDF
+
+    No dependen de los datos: se arman una sola vez (al primer PDF, para
+    no importar reportlab al cargar el módulo) y se reutilizan.
+
+    Returns:
+        Diccionario con la hoja de estilos base, los ParagraphStyle y los TableStyle
+    """
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
+    styles = getSampleStyleSheet()
+
+    return {
+        "base": styles,
+        "titulo": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#00CC66'),
+            spaceAfter=12,
+            alignment=TA_CENTER
+        ),
+        "subtitulo": ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.grey,
+            spaceAfter=12,
+            alignment=TA_CENTER
+        ),
+        "tabla_stats": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#00CC66')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+        "tabla_transacciones": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#00CC66')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (4, 1), (4, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ])
+    }
+
+
 def exportar_a_pdf(transacciones: List, stats: Dict = None) -> BytesIO:
     """
     Exporta transacciones a PDF con formato profesional
@@ -172,12 +393,9 @@ def exportar_a_pdf(transacciones: List, stats: Dict = None) -> BytesIO:
         BytesIO con el archivo PDF
     """
     try:
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
         from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
     except ImportError:
         # Si reportlab no está disponible, devolver None
         return None
@@ -194,26 +412,11 @@ def exportar_a_pdf(transacciones: List, stats: Dict = None) -> BytesIO:
         bottomMargin=30
     )
 
-    # Estilos
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#00CC66'),
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
-
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.grey,
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
+    # Estilos (armados una sola vez)
+    estilos = _estilos_pdf()
+    styles = estilos["base"]
+    title_style = estilos["titulo"]
+    subtitle_style = estilos["subtitulo"]
 
     # Elementos del documento
     elements = []
@@ -235,17 +438,7 @@ def exportar_a_pdf(transacciones: List, stats: Dict = None) -> BytesIO:
         ]
 
         stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
-        stats_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#00CC66')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        stats_table.setStyle(estilos["tabla_stats"])
 
         elements.append(stats_table)
         elements.append(Spacer(1, 0.3*inch))
@@ -254,47 +447,35 @@ def exportar_a_pdf(transacciones: List, stats: Dict = None) -> BytesIO:
     elements.append(Paragraph("Detalle de Transacciones", styles['Heading2']))
     elements.append(Spacer(1, 0.2*inch))
 
-    # Helper para strings seguros
-    def safe_str(value):
-        """Convierte valor a string seguro manejando encoding"""
-        if value is None:
-            return ""
-        try:
-            return str(value)
-        except:
-            return ""
-
-    # Preparar datos
-    table_data = [["ID", "Fecha", "Tipo", "Categoría", "Monto", "Persona"]]
-
-    for t in transacciones[:100]:  # Limitar a 100 para no hacer el PDF muy grande
-        categoria_safe = safe_str(t.categoria)[:15] if t.categoria else ""
-        persona_safe = safe_str(t.persona)[:12] if t.persona else "General"
-
-        table_data.append([
-            str(t.id),
-            t.fecha_transaccion.strftime('%Y-%m-%d') if t.fecha_transaccion else "",
-            safe_str(t.tipo.value.upper() if t.tipo else ""),
-            categoria_safe,
-            f"${t.monto:,.2f}",
-            persona_safe
-        ])
+    # Sin transacciones no hay tabla que armar
+    if not transacciones:
+        elements.append(Paragraph("No hay transacciones para el filtro seleccionado", subtitle_style))
+        doc.build(elements)
+
+        output.seek(0)
+        return output
+
+    # Preparar datos (limitar a 100 para no hacer el PDF muy grande),
+    # formateando por columna en lugar de fila por fila
+    crudo = _columnas_transacciones(
+        transacciones[:100],
+        ("id", "fecha_transaccion", "tipo", "categoria", "monto", "persona")
+    )
+
+    df = pd.DataFrame({
+        "ID": crudo["id"].astype(str),
+        "Fecha": pd.to_datetime(crudo["fecha_transaccion"]).dt.strftime('%Y-%m-%d').fillna(""),
+        "Tipo": _valor_enum(crudo["tipo"]),
+        "Categoría": _texto(crudo["categoria"]).str.slice(0, 15),
+        "Monto": crudo["monto"].map("${:,.2f}".format),
+        "Persona": _texto(crudo["persona"]).str.slice(0, 12).replace("", "General")
+    })
+
+    table_data = [list(df.columns)] + df.values.tolist()
 
     # Crear tabla
     trans_table = Table(table_data, colWidths=[0.5*inch, 1*inch, 0.8*inch, 1.5*inch, 1.2*inch, 1.2*inch])
-    trans_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#00CC66')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('ALIGN', (4, 1), (4, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    trans_table.setStyle(estilos["tabla_transacciones"])
 
     elements.append(trans_table)
 
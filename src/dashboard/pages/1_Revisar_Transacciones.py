@@ -3,36 +3,69 @@ Interfaz Completa de Revisión y Edición Manual de Transacciones
 FacturIA 2.1.0 - Sistema Profesional de Gestión Financiera
 """
 import streamlit as st
-import pandas as pd
 from datetime import datetime, date
 from pathlib import Path
 import sys
-import time
 
 BASE_DIR = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
 from src.database import (
     get_database,
-    obtener_transacciones,
-    obtener_transaccion,
+    obtener_filas_transacciones_keyset,
+    contar_estados_revision,
+    obtener_fila_transaccion,
     actualizar_transaccion,
     eliminar_transaccion,
     crear_transaccion
 )
 from src.config import CATEGORIAS_INGRESOS, CATEGORIAS_EGRESOS
-from src.database.models import TipoTransaccion
-
-# ==================== CONFIGURACIÓN ====================
+from src.database.models import Transaccion, TipoTransaccion
+from sqlalchemy import func, select
+
+# Columnas que cambian con cada escritura de una transacción: detectan si una
+# fila guardada quedó vieja. fecha_modificacion en SQLite tiene resolución de
+# segundos; fecha_ultima_edicion la guarda cada edición con microsegundos
+COLUMNAS_VERSION = (Transaccion.fecha_modificacion, Transaccion.fecha_ultima_edicion)
+
+# Columnas que usan el listado y la vista previa de edición (se traen como
+# filas livianas, sin objetos ORM). Los valores por defecto de persona y
+# emisor/receptor se resuelven en la consulta con COALESCE. Incluyen las de
+# versión para saber si una fila del listado cacheado sigue vigente
+COLUMNAS_LISTADO = (
+    Transaccion.id,
+    Transaccion.fecha_transaccion,
+    Transaccion.tipo,
+    Transaccion.categoria,
+    Transaccion.monto,
+    func.coalesce(func.nullif(Transaccion.persona, ""), "General").label("persona"),
+    func.coalesce(Transaccion.emisor_receptor, "").label("emisor_receptor"),
+    Transaccion.descripcion,
+    Transaccion.numero_comprobante,
+    Transaccion.requiere_revision,
+    Transaccion.razon_revision,
+    Transaccion.editado_manualmente,
+    Transaccion.procesado_por_ia,
+    *COLUMNAS_VERSION
+)
 
-st.set_page_config(
-    page_title="FacturIA 2.1.0 - Revisar y Editar",
-    page_icon="📝",
-    layout="wide"
+# Texto de la columna Estado para cada combinación de flags, indexado por
+# (requiere_revision << 2) | (editado_manualmente << 1) | procesado_por_ia
+ESTADOS_LISTADO = (
+    "✅", "🤖", "✏️", "✏️ 🤖",
+    "⚠️", "⚠️ 🤖", "⚠️ ✏️", "⚠️ ✏️ 🤖"
 )
 
-# CSS personalizado
-st.markdown("""
+# Opciones de los selectbox de tipo y categoría, armadas una sola vez
+TIPOS_TRANSACCION = ("ingreso", "egreso")
+TIPO_POR_VALOR = {tipo.value: tipo for tipo in TipoTransaccion}
+CATEGORIAS_POR_TIPO = {
+    "ingreso": tuple(CATEGORIAS_INGRESOS),
+    "egreso": tuple(CATEGORIAS_EGRESOS)
+}
+
+# CSS personalizado (constante de módulo: se arma una sola vez por proceso)
+ESTILOS_CSS = """
 <style>
 .stAlert {
     border-radius: 10px;
@@ -44,33 +77,470 @@ st.markdown("""
     border-left: 4px solid #00CC66;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# ==================== CONFIGURACIÓN ====================
+
+st.set_page_config(
+    page_title="FacturIA 2.1.0 - Revisar y Editar",
+    page_icon="📝",
+    layout="wide"
+)
+
+# Se emite en cada rerun: Streamlit descarta los elementos que el script no
+# repite, así que cachear esta llamada dejaría la página sin estilos
+st.markdown(ESTILOS_CSS, unsafe_allow_html=True)
 
 # ==================== FUNCIONES AUXILIARES ====================
 
+# Intercambia los separadores del formato en inglés (1,234.56 -> 1.234,56)
+SEPARADORES_MONTO = str.maketrans(",.", ".,")
+
+# Caracteres que se descartan al parsear un monto escrito por el usuario
+CARACTERES_IGNORADOS_MONTO = str.maketrans("", "", "$ .")
+
+
+def version_fila(fila) -> tuple:
+    """Valores de COLUMNAS_VERSION de una fila de COLUMNAS_LISTADO"""
+    return tuple(getattr(fila, columna.key) for columna in COLUMNAS_VERSION)
+
+
 def formatear_monto(monto: float) -> str:
-    """Formatea un monto con separadores"""
-    return f"${monto:,.2f}".replace(",", ".")
+    """Formatea un monto con separadores (punto de miles, coma decimal)"""
+    return f"${monto:,.2f}".translate(SEPARADORES_MONTO)
+
+
+def formatear_montos(montos: "pd.Series") -> "pd.Series":
+    """Versión vectorizada de formatear_monto para columnas completas"""
+    return ("$" + montos.map("{:,.2f}".format)).str.translate(SEPARADORES_MONTO)
+
+
+def truncar_texto(columna: "pd.Series", largo: int) -> "pd.Series":
+    """Recorta una columna de texto a `largo` caracteres (con "..." si se cortó)"""
+    columna = columna.fillna("")
+    recortada = columna.str.slice(0, largo)
+    return recortada.where(columna.str.len() <= largo, recortada + "...")
+
+
+@st.cache_resource
+def indices_categorias(tipo: str) -> dict:
+    """
+    Posición de cada categoría en la lista del tipo (para el índice del selectbox)
+
+    El script de la página se re-ejecuta en cada interacción; el diccionario
+    se arma una vez y se comparte sin copiarlo (no se modifica).
+    """
+    return {categoria: indice for indice, categoria in enumerate(CATEGORIAS_POR_TIPO[tipo])}
+
+
+@st.cache_resource
+def inicializar_db():
+    """Conexión a la base de datos (una por proceso, no una por rerun)"""
+    return get_database()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cargar_listado(tipo: str, requiere_revision: bool, limite: int, despues_de_id: int = None) -> list:
+    """
+    Página del listado (por ID descendente, paginada por keyset)
+
+    Devuelve filas de Core (no objetos ORM) para que se puedan cachear;
+    se invalida al crear, guardar o eliminar una transacción.
+
+    Args:
+        tipo: Filtrar por tipo (ingreso/egreso) o None
+        requiere_revision: Filtrar por estado de revisión o None
+        limite: Cantidad máxima de filas
+        despues_de_id: Último ID de la página anterior (None = primera página)
+
+    Returns:
+        Lista de filas con las columnas de COLUMNAS_LISTADO
+    """
+    with inicializar_db().get_session() as session:
+        filas = obtener_filas_transacciones_keyset(
+            session,
+            COLUMNAS_LISTADO,
+            despues_de_id=despues_de_id,
+            limite=limite,
+            tipo=tipo,
+            requiere_revision=requiere_revision
+        )
+
+    return list(filas)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cargar_conteos(tipo: str, requiere_revision: bool) -> dict:
+    """Contadores de todas las transacciones del filtro (no solo de la página)"""
+    with inicializar_db().get_session() as session:
+        return contar_estados_revision(
+            session,
+            tipo=tipo,
+            requiere_revision=requiere_revision
+        )
 
 
 def parsear_monto(monto_str: str) -> float:
     """Parsea un string de monto a float"""
     try:
-        # Remover símbolos y espacios
-        monto_limpio = monto_str.replace("$", "").replace(" ", "").replace(".", "").replace(",", ".")
-        return float(monto_limpio)
+        # Remover símbolos, espacios y separadores de miles en una pasada
+        return float(monto_str.translate(CARACTERES_IGNORADOS_MONTO).replace(",", "."))
     except ValueError:
         return 0.0
 
 
+# ==================== SECCIONES: VER Y EDITAR ====================
+
+# Con st.fragment (Streamlit >= 1.37) cada sección se re-ejecuta sola al
+# interactuar con sus widgets: elegir otro ID no rearma el listado y cambiar
+# un filtro no vuelve a consultar la transacción en edición. En versiones
+# anteriores las secciones corren como funciones comunes.
+fragmento = getattr(st, "fragment", None) or (lambda funcion: funcion)
+
+
+@fragmento
+def seccion_listado():
+    """Filtros, contadores y tabla de transacciones"""
+    # pandas/numpy solo hacen falta para la tabla: el modo "Crear" no los carga
+    import numpy as np
+    import pandas as pd
+
+    # Filtros
+    with st.expander("🔍 Filtros", expanded=False):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            filtro_tipo = st.selectbox(
+                "Tipo",
+                ["Todas", "Ingresos", "Egresos"]
+            )
+
+        with col2:
+            filtro_requiere_revision = st.selectbox(
+                "Estado de Revisión",
+                ["Todas", "Requiere revisión", "Revisadas"]
+            )
+
+        with col3:
+            filtro_limite = st.number_input(
+                "Transacciones por página",
+                min_value=10,
+                max_value=500,
+                value=100,
+                step=10
+            )
+
+    tipo_filtrado = None
+    if filtro_tipo == "Ingresos":
+        tipo_filtrado = "ingreso"
+    elif filtro_tipo == "Egresos":
+        tipo_filtrado = "egreso"
+
+    revision_filtrada = None
+    if filtro_requiere_revision == "Requiere revisión":
+        revision_filtrada = True
+    elif filtro_requiere_revision == "Revisadas":
+        revision_filtrada = False
+
+    # Paginación keyset: pila con el cursor (último ID anterior) de cada
+    # página visitada; se reinicia si cambian los filtros
+    filtros_actuales = (tipo_filtrado, revision_filtrada, int(filtro_limite))
+    if st.session_state.get("filtros_listado") != filtros_actuales:
+        st.session_state["filtros_listado"] = filtros_actuales
+        st.session_state["cursores_listado"] = [None]
+
+    cursores = st.session_state["cursores_listado"]
+
+    # Obtener la página con filtros (el filtro de revisión va en la consulta);
+    # se pide una fila de más para saber si hay página siguiente
+    filas = cargar_listado(tipo_filtrado, revision_filtrada, int(filtro_limite) + 1, cursores[-1])
+    transacciones = filas[:int(filtro_limite)]
+    hay_siguiente = len(filas) > len(transacciones)
+
+    # La sección de edición toma de acá la fila a editar si está en pantalla
+    st.session_state["listado_por_id"] = {fila.id: fila for fila in transacciones}
+
+    conteos = cargar_conteos(tipo_filtrado, revision_filtrada)
+
+    # Mostrar estadísticas
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("📊 Total Transacciones", conteos["total"])
+
+    with col2:
+        st.metric("⚠️ Requieren Revisión", conteos["requieren_revision"])
+
+    with col3:
+        st.metric("✏️ Editadas Manualmente", conteos["editadas"])
+
+    with col4:
+        st.metric("🤖 Procesadas por IA", conteos["procesadas_ia"])
+
+    st.markdown("---")
+
+    # Tabla de transacciones
+    if not transacciones:
+        st.info("📭 No hay transacciones que coincidan con los filtros. Ejecuta: `python crear_datos_prueba.py`")
+        return
+
+    st.subheader(f"📋 Listado de Transacciones ({len(transacciones)}) - Página {len(cursores)}")
+
+    # Crear DataFrame para visualización: las filas van directo a
+    # columnas y el formato se aplica por columna (sin un dict por fila)
+    crudo = pd.DataFrame.from_records(
+        transacciones,
+        columns=[columna.key for columna in COLUMNAS_LISTADO]
+    )
+
+    # Estado: los tres flags forman un índice de 0 a 7 sobre la tabla de textos
+    flags = crudo[["requiere_revision", "editado_manualmente", "procesado_por_ia"]].fillna(False).to_numpy(dtype=np.uint8)
+    estado = np.take(ESTADOS_LISTADO, (flags[:, 0] << 2) | (flags[:, 1] << 1) | flags[:, 2])
+
+    df = pd.DataFrame({
+        "ID": crudo["id"],
+        "Estado": estado,
+        "Fecha": pd.to_datetime(crudo["fecha_transaccion"]).dt.strftime('%Y-%m-%d').fillna("N/A"),
+        "Tipo": crudo["tipo"].map({TipoTransaccion.INGRESO: "💵"}).fillna("💸"),
+        "Categoría": crudo["categoria"],
+        "Monto": formatear_montos(crudo["monto"]),
+        "Persona": crudo["persona"],
+        "Emisor/Receptor": truncar_texto(crudo["emisor_receptor"], 20),
+        "Descripción": truncar_texto(crudo["descripcion"], 30)
+    })
+
+    # Mostrar tabla
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Monto": st.column_config.TextColumn("Monto", help="Monto de la transacción"),
+            "Estado": st.column_config.TextColumn("Estado", help="⚠️=Revisión ✏️=Editada 🤖=IA ✅=OK")
+        }
+    )
+
+    # Navegación entre páginas
+    col_anterior, col_siguiente = st.columns(2)
+
+    with col_anterior:
+        st.button(
+            "⬅️ Anterior",
+            disabled=len(cursores) == 1,
+            on_click=cursores.pop,
+            use_container_width=True
+        )
+
+    with col_siguiente:
+        st.button(
+            "Siguiente ➡️",
+            disabled=not hay_siguiente,
+            on_click=cursores.append,
+            args=(int(crudo["id"].iloc[-1]),),
+            use_container_width=True
+        )
+
+
+@fragmento
+def seccion_edicion():
+    """Selector por ID, información actual y formulario de edición"""
+    st.subheader("✏️ Editar Transacción")
+
+    # Selector de transacción a editar
+    transaccion_id_editar = st.number_input(
+        "ID de Transacción a Editar",
+        min_value=1,
+        value=1,
+        step=1,
+        help="Ingresa el ID de la transacción que deseas editar"
+    )
+
+    # Si la transacción está en la página del listado se usa esa fila
+    transaccion_listado = st.session_state.get("listado_por_id", {}).get(int(transaccion_id_editar))
+
+    with inicializar_db().get_session() as session:
+        # Versión actual de la fila: solo COLUMNAS_VERSION, por ID
+        version = session.execute(
+            select(*COLUMNAS_VERSION).where(Transaccion.id == int(transaccion_id_editar))
+        ).first()
+        version = tuple(version) if version else None
+
+        # El listado está cacheado: su fila sirve solo si nadie la cambió desde
+        # entonces (si no, guardar pisaría el cambio más nuevo)
+        transaccion_editar = None
+        if transaccion_listado is not None and version_fila(transaccion_listado) == version:
+            transaccion_editar = transaccion_listado
+
+        # Obtener transacción a editar. La fila consultada queda en la sesión
+        # del navegador y se reutiliza en los reruns mientras no cambien el ID
+        # ni su versión
+        if transaccion_editar is None:
+            clave_cache = (int(transaccion_id_editar), version)
+            if st.session_state.get("transaccion_cache_clave") != clave_cache:
+                st.session_state["transaccion_cache"] = obtener_fila_transaccion(
+                    session, COLUMNAS_LISTADO, int(transaccion_id_editar)
+                )
+                st.session_state["transaccion_cache_clave"] = clave_cache
+            transaccion_editar = st.session_state["transaccion_cache"]
+
+        if transaccion_editar:
+            # Mostrar información actual
+            with st.expander(f"📄 Transacción #{transaccion_editar.id} - Información Actual", expanded=True):
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.write(f"**Tipo:** {transaccion_editar.tipo.value.upper() if transaccion_editar.tipo else 'N/A'}")
+                    st.write(f"**Categoría:** {transaccion_editar.categoria}")
+                    st.write(f"**Monto:** {formatear_monto(transaccion_editar.monto)}")
+
+                with col2:
+                    st.write(f"**Fecha:** {transaccion_editar.fecha_transaccion.strftime('%Y-%m-%d') if transaccion_editar.fecha_transaccion else 'N/A'}")
+                    st.write(f"**Persona:** {transaccion_editar.persona}")
+                    st.write(f"**Emisor/Receptor:** {transaccion_editar.emisor_receptor or 'N/A'}")
+
+                with col3:
+                    st.write(f"**Requiere Revisión:** {'⚠️ Sí' if transaccion_editar.requiere_revision else '✅ No'}")
+                    st.write(f"**Procesada por IA:** {'🤖 Sí' if transaccion_editar.procesado_por_ia else '❌ No'}")
+                    st.write(f"**Editada:** {'✏️ Sí' if transaccion_editar.editado_manualmente else '❌ No'}")
+
+                if transaccion_editar.descripcion:
+                    st.write(f"**Descripción:** {transaccion_editar.descripcion}")
+
+                if transaccion_editar.requiere_revision and hasattr(transaccion_editar, 'razon_revision'):
+                    st.warning(f"⚠️ Razón de revisión: {transaccion_editar.razon_revision}")
+
+            # Formulario de edición
+            st.markdown("### 📝 Editar Valores")
+
+            with st.form(f"form_editar_{transaccion_id_editar}"):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    tipo_editado = st.selectbox(
+                        "Tipo",
+                        TIPOS_TRANSACCION,
+                        index=0 if transaccion_editar.tipo == TipoTransaccion.INGRESO else 1
+                    )
+
+                    # Índice de categoría actual (0 si no está en la lista del tipo)
+                    indice_categoria = indices_categorias(tipo_editado).get(transaccion_editar.categoria, 0)
+
+                    categoria_editada = st.selectbox(
+                        "Categoría",
+                        CATEGORIAS_POR_TIPO[tipo_editado],
+                        index=indice_categoria
+                    )
+
+                    monto_editado = st.number_input(
+                        "Monto",
+                        min_value=0.01,
+                        value=float(transaccion_editar.monto),
+                        step=10.0,
+                        format="%.2f"
+                    )
+
+                    fecha_editada = st.date_input(
+                        "Fecha",
+                        value=transaccion_editar.fecha_transaccion.date() if transaccion_editar.fecha_transaccion else date.today()
+                    )
+
+                with col2:
+                    persona_editada = st.text_input(
+                        "Persona",
+                        value=transaccion_editar.persona
+                    )
+
+                    emisor_receptor_editado = st.text_input(
+                        "Emisor/Receptor",
+                        value=transaccion_editar.emisor_receptor
+                    )
+
+                    numero_comprobante_editado = st.text_input(
+                        "Número de Comprobante",
+                        value=transaccion_editar.numero_comprobante or ""
+                    )
+
+                descripcion_editada = st.text_area(
+                    "Descripción",
+                    value=transaccion_editar.descripcion or ""
+                )
+
+                requiere_revision_editado = st.checkbox(
+                    "Marcar como 'Requiere Revisión'",
+                    value=transaccion_editar.requiere_revision
+                )
+
+                col_btn1, col_btn2 = st.columns([1, 1])
+
+                with col_btn1:
+                    guardar = st.form_submit_button("✅ Guardar Cambios", use_container_width=True)
+
+                with col_btn2:
+                    eliminar = st.form_submit_button("⚠️ Eliminar Permanentemente", use_container_width=True, type="secondary")
+
+                if guardar:
+                    try:
+                        datos_actualizados = {
+                            "tipo": TIPO_POR_VALOR[tipo_editado],
+                            "categoria": categoria_editada,
+                            "monto": monto_editado,
+                            "fecha_transaccion": datetime.combine(fecha_editada, datetime.min.time()),
+                            "persona": persona_editada,
+                            "emisor_receptor": emisor_receptor_editado,
+                            "descripcion": descripcion_editada,
+                            "numero_comprobante": numero_comprobante_editado,
+                            "requiere_revision": requiere_revision_editado,
+                            "editado_manualmente": True,
+                            "fecha_ultima_edicion": datetime.now()
+                        }
+
+                        actualizar_transaccion(session, transaccion_id_editar, datos_actualizados)
+                        session.commit()  # Commit explícito antes de rerun
+                        st.cache_data.clear()
+                        st.session_state.pop("transaccion_cache", None)
+                        st.session_state.pop("transaccion_cache_clave", None)
+                        st.session_state.pop("exportacion_transacciones", None)
+
+                        st.session_state["mensaje_accion"] = f"✅ Transacción #{transaccion_id_editar} actualizada exitosamente!"
+                        st.rerun()
+
+                    except Exception as e:
+                        session.rollback()  # Rollback en caso de error
+                        st.error(f"❌ Error al actualizar transacción: {e}")
+
+                if eliminar:
+                    try:
+                        eliminar_transaccion(session, transaccion_id_editar)
+                        session.commit()  # Commit explícito antes de rerun
+                        st.cache_data.clear()
+                        st.session_state.pop("transaccion_cache", None)
+                        st.session_state.pop("transaccion_cache_clave", None)
+                        st.session_state.pop("exportacion_transacciones", None)
+
+                        st.session_state["mensaje_accion"] = f"🗑️ Transacción #{transaccion_id_editar} eliminada exitosamente!"
+                        st.rerun()
+                    except Exception as e:
+                        session.rollback()  # Rollback en caso de error
+                        st.error(f"❌ Error al eliminar transacción: {e}")
+
+        else:
+            st.warning(f"⚠️ No se encontró transacción con ID #{transaccion_id_editar}")
+
+
 # ==================== MAIN ====================
 
 st.title("📝 Revisar y Editar Transacciones")
 st.markdown("**Gestión Manual de Transacciones - FacturIA 2.1.0**")
 st.markdown("---")
 
+# Mensaje de la última acción: se guarda antes del rerun y se muestra acá,
+# así no hace falta frenar el script (con la sesión abierta) para que se vea
+mensaje_accion = st.session_state.pop("mensaje_accion", None)
+if mensaje_accion:
+    st.success(mensaje_accion)
+
 # Inicializar base de datos
-db = get_database()
+db = inicializar_db()
 
 if not db or not db.verificar_conexion():
     st.error("❌ Error al conectar con la base de datos. Verifica la configuración.")
@@ -97,19 +567,13 @@ if modo == "➕ Crear Nueva Transacción":
         with col1:
             tipo_nuevo = st.selectbox(
                 "Tipo *",
-                ["ingreso", "egreso"],
+                TIPOS_TRANSACCION,
                 help="Tipo de transacción"
             )
 
-            # Categorías según el tipo
-            if tipo_nuevo == "ingreso":
-                categorias_disponibles = CATEGORIAS_INGRESOS
-            else:
-                categorias_disponibles = CATEGORIAS_EGRESOS
-
             categoria_nuevo = st.selectbox(
                 "Categoría *",
-                categorias_disponibles,
+                CATEGORIAS_POR_TIPO[tipo_nuevo],
                 help="Categoría de la transacción"
             )
 
@@ -159,7 +623,7 @@ if modo == "➕ Crear Nueva Transacción":
                 try:
                     with db.get_session() as session:
                         nueva_transaccion = {
-                            "tipo": tipo_nuevo,
+                            "tipo": TIPO_POR_VALOR[tipo_nuevo],
                             "categoria": categoria_nuevo,
                             "monto": monto_nuevo,
                             "fecha_transaccion": datetime.combine(fecha_nuevo, datetime.min.time()),
@@ -178,283 +642,25 @@ if modo == "➕ Crear Nueva Transacción":
                         st.success(f"✅ Transacción #{transaccion_creada.id} creada exitosamente!")
                         st.balloons()
 
+                    # El listado y las estadísticas cacheadas ya no reflejan la BD
+                    st.cache_data.clear()
+                    st.session_state.pop("transaccion_cache", None)
+                    st.session_state.pop("transaccion_cache_clave", None)
+                    st.session_state.pop("exportacion_transacciones", None)
+
                 except Exception as e:
                     st.error(f"❌ Error al crear transacción: {e}")
 
 # ==================== MODO: VER Y EDITAR ====================
 
 else:
-    # Filtros
-    with st.expander("🔍 Filtros", expanded=False):
-        col1, col2, col3 = st.columns(3)
+    seccion_listado()
 
-        with col1:
-            filtro_tipo = st.selectbox(
-                "Tipo",
-                ["Todas", "Ingresos", "Egresos"]
-            )
+    st.markdown("---")
 
-        with col2:
-            filtro_requiere_revision = st.selectbox(
-                "Estado de Revisión",
-                ["Todas", "Requiere revisión", "Revisadas"]
-            )
-
-        with col3:
-            filtro_limite = st.number_input(
-                "Cantidad a mostrar",
-                min_value=10,
-                max_value=500,
-                value=100,
-                step=10
-            )
-
-    # Obtener transacciones con filtros
-    with db.get_session() as session:
-        tipo_filtrado = None
-        if filtro_tipo == "Ingresos":
-            tipo_filtrado = "ingreso"
-        elif filtro_tipo == "Egresos":
-            tipo_filtrado = "egreso"
-
-        transacciones = obtener_transacciones(
-            session,
-            tipo=tipo_filtrado,
-            limite=int(filtro_limite)
-        )
-
-        # Filtrar por revisión si es necesario
-        if filtro_requiere_revision == "Requiere revisión":
-            transacciones = [t for t in transacciones if t.requiere_revision]
-        elif filtro_requiere_revision == "Revisadas":
-            transacciones = [t for t in transacciones if not t.requiere_revision]
-
-        # Mostrar estadísticas
-        col1, col2, col3, col4 = st.columns(4)
-
-        with col1:
-            st.metric("📊 Total Transacciones", len(transacciones))
+    # ==================== SECCIÓN DE EDICIÓN ====================
 
-        with col2:
-            requieren_revision = sum(1 for t in transacciones if t.requiere_revision)
-            st.metric("⚠️ Requieren Revisión", requieren_revision)
-
-        with col3:
-            editadas = sum(1 for t in transacciones if t.editado_manualmente)
-            st.metric("✏️ Editadas Manualmente", editadas)
-
-        with col4:
-            procesadas_ia = sum(1 for t in transacciones if t.procesado_por_ia)
-            st.metric("🤖 Procesadas por IA", procesadas_ia)
-
-        st.markdown("---")
-
-        # Tabla de transacciones
-        if transacciones:
-            st.subheader(f"📋 Listado de Transacciones ({len(transacciones)})")
-
-            # Crear DataFrame para visualización
-            data = []
-            for t in transacciones:
-                status = []
-                if t.requiere_revision:
-                    status.append("⚠️")
-                if t.editado_manualmente:
-                    status.append("✏️")
-                if t.procesado_por_ia:
-                    status.append("🤖")
-
-                data.append({
-                    "ID": t.id,
-                    "Estado": " ".join(status) if status else "✅",
-                    "Fecha": t.fecha_transaccion.strftime('%Y-%m-%d') if t.fecha_transaccion else "N/A",
-                    "Tipo": "💵" if t.tipo == TipoTransaccion.INGRESO else "💸",
-                    "Categoría": t.categoria,
-                    "Monto": formatear_monto(t.monto),
-                    "Persona": t.persona or "General",
-                    "Emisor/Receptor": (t.emisor_receptor[:20] + "...") if t.emisor_receptor and len(t.emisor_receptor) > 20 else (t.emisor_receptor or ""),
-                    "Descripción": (t.descripcion[:30] + "...") if t.descripcion and len(t.descripcion) > 30 else (t.descripcion or "")
-                })
-
-            df = pd.DataFrame(data)
-
-            # Mostrar tabla
-            st.dataframe(
-                df,
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Monto": st.column_config.TextColumn("Monto", help="Monto de la transacción"),
-                    "Estado": st.column_config.TextColumn("Estado", help="⚠️=Revisión ✏️=Editada 🤖=IA ✅=OK")
-                }
-            )
-
-            st.markdown("---")
-
-            # ==================== SECCIÓN DE EDICIÓN ====================
-
-            st.subheader("✏️ Editar Transacción")
-
-            # Selector de transacción a editar
-            transaccion_id_editar = st.number_input(
-                "ID de Transacción a Editar",
-                min_value=1,
-                value=1,
-                step=1,
-                help="Ingresa el ID de la transacción que deseas editar"
-            )
-
-            # Obtener transacción a editar
-            transaccion_editar = obtener_transaccion(session, int(transaccion_id_editar))
-
-            if transaccion_editar:
-                # Mostrar información actual
-                with st.expander(f"📄 Transacción #{transaccion_editar.id} - Información Actual", expanded=True):
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        st.write(f"**Tipo:** {transaccion_editar.tipo.value.upper() if transaccion_editar.tipo else 'N/A'}")
-                        st.write(f"**Categoría:** {transaccion_editar.categoria}")
-                        st.write(f"**Monto:** {formatear_monto(transaccion_editar.monto)}")
-
-                    with col2:
-                        st.write(f"**Fecha:** {transaccion_editar.fecha_transaccion.strftime('%Y-%m-%d') if transaccion_editar.fecha_transaccion else 'N/A'}")
-                        st.write(f"**Persona:** {transaccion_editar.persona or 'General'}")
-                        st.write(f"**Emisor/Receptor:** {transaccion_editar.emisor_receptor or 'N/A'}")
-
-                    with col3:
-                        st.write(f"**Requiere Revisión:** {'⚠️ Sí' if transaccion_editar.requiere_revision else '✅ No'}")
-                        st.write(f"**Procesada por IA:** {'🤖 Sí' if transaccion_editar.procesado_por_ia else '❌ No'}")
-                        st.write(f"**Editada:** {'✏️ Sí' if transaccion_editar.editado_manualmente else '❌ No'}")
-
-                    if transaccion_editar.descripcion:
-                        st.write(f"**Descripción:** {transaccion_editar.descripcion}")
-
-                    if transaccion_editar.requiere_revision and hasattr(transaccion_editar, 'razon_revision'):
-                        st.warning(f"⚠️ Razón de revisión: {transaccion_editar.razon_revision}")
-
-                # Formulario de edición
-                st.markdown("### 📝 Editar Valores")
-
-                with st.form(f"form_editar_{transaccion_id_editar}"):
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        tipo_editado = st.selectbox(
-                            "Tipo",
-                            ["ingreso", "egreso"],
-                            index=0 if transaccion_editar.tipo == TipoTransaccion.INGRESO else 1
-                        )
-
-                        # Categorías según el tipo
-                        if tipo_editado == "ingreso":
-                            categorias_disponibles = CATEGORIAS_INGRESOS
-                        else:
-                            categorias_disponibles = CATEGORIAS_EGRESOS
-
-                        # Índice de categoría actual
-                        try:
-                            indice_categoria = categorias_disponibles.index(transaccion_editar.categoria)
-                        except ValueError:
-                            indice_categoria = 0
-
-                        categoria_editada = st.selectbox(
-                            "Categoría",
-                            categorias_disponibles,
-                            index=indice_categoria
-                        )
-
-                        monto_editado = st.number_input(
-                            "Monto",
-                            min_value=0.01,
-                            value=float(transaccion_editar.monto),
-                            step=10.0,
-                            format="%.2f"
-                        )
-
-                        fecha_editada = st.date_input(
-                            "Fecha",
-                            value=transaccion_editar.fecha_transaccion.date() if transaccion_editar.fecha_transaccion else date.today()
-                        )
-
-                    with col2:
-                        persona_editada = st.text_input(
-                            "Persona",
-                            value=transaccion_editar.persona or "General"
-                        )
-
-                        emisor_receptor_editado = st.text_input(
-                            "Emisor/Receptor",
-                            value=transaccion_editar.emisor_receptor or ""
-                        )
-
-                        numero_comprobante_editado = st.text_input(
-                            "Número de Comprobante",
-                            value=transaccion_editar.numero_comprobante or ""
-                        )
-
-                    descripcion_editada = st.text_area(
-                        "Descripción",
-                        value=transaccion_editar.descripcion or ""
-                    )
-
-                    requiere_revision_editado = st.checkbox(
-                        "Marcar como 'Requiere Revisión'",
-                        value=transaccion_editar.requiere_revision
-                    )
-
-                    col_btn1, col_btn2 = st.columns([1, 1])
-
-                    with col_btn1:
-                        guardar = st.form_submit_button("✅ Guardar Cambios", use_container_width=True)
-
-                    with col_btn2:
-                        eliminar = st.form_submit_button("⚠️ Eliminar Permanentemente", use_container_width=True, type="secondary")
-
-                    if guardar:
-                        try:
-                            datos_actualizados = {
-                                "tipo": TipoTransaccion(tipo_editado),
-                                "categoria": categoria_editada,
-                                "monto": monto_editado,
-                                "fecha_transaccion": datetime.combine(fecha_editada, datetime.min.time()),
-                                "persona": persona_editada,
-                                "emisor_receptor": emisor_receptor_editado,
-                                "descripcion": descripcion_editada,
-                                "numero_comprobante": numero_comprobante_editado,
-                                "requiere_revision": requiere_revision_editado,
-                                "editado_manualmente": True,
-                                "fecha_ultima_edicion": datetime.now()
-                            }
-
-                            actualizar_transaccion(session, transaccion_id_editar, datos_actualizados)
-                            session.commit()  # Commit explícito antes de rerun
-
-                            st.success(f"✅ Transacción #{transaccion_id_editar} actualizada exitosamente!")
-                            time.sleep(1)  # Pequeña pausa para mostrar el mensaje
-                            st.rerun()
-
-                        except Exception as e:
-                            session.rollback()  # Rollback en caso de error
-                            st.error(f"❌ Error al actualizar transacción: {e}")
-
-                    if eliminar:
-                        try:
-                            eliminar_transaccion(session, transaccion_id_editar)
-                            session.commit()  # Commit explícito antes de rerun
-
-                            st.success(f"🗑️ Transacción #{transaccion_id_editar} eliminada exitosamente!")
-                            time.sleep(1)  # Pequeña pausa para mostrar el mensaje
-                            st.rerun()
-                        except Exception as e:
-                            session.rollback()  # Rollback en caso de error
-                            st.error(f"❌ Error al eliminar transacción: {e}")
-
-            else:
-                st.warning(f"⚠️ No se encontró transacción con ID #{transaccion_id_editar}")
-
-        else:
-            st.info("📭 No hay transacciones que coincidan con los filtros. Ejecuta: `python crear_datos_prueba.py`")
+    seccion_edicion()
 
 # Footer
 st.markdown("---")
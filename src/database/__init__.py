@@ -7,7 +7,12 @@ from .crud import (
     crear_transaccion,
     crear_transacciones_batch,
     obtener_transaccion,
+    obtener_fila_transaccion,
     obtener_transacciones,
+    obtener_filas_transacciones,
+    obtener_filas_transacciones_keyset,
+    contar_transacciones,
+    contar_estados_revision,
     actualizar_transaccion,
     eliminar_transaccion,
     registrar_archivo_procesado,
@@ -30,7 +35,12 @@ __all__ = [
     "crear_transaccion",
     "crear_transacciones_batch",
     "obtener_transaccion",
+    "obtener_fila_transaccion",
     "obtener_transacciones",
+    "obtener_filas_transacciones",
+    "obtener_filas_transacciones_keyset",
+    "contar_transacciones",
+    "contar_estados_revision",
     "actualizar_transaccion",
     "eliminar_transaccion",
     "registrar_archivo_procesado",
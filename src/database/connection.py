@@ -3,18 +3,53 @@ Gestión de conexión a la base de datos
 Configuración de SQLAlchemy y gestión de sesiones
 """
 from sqlalchemy import create_engine, event, text
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import OperationalError, DBAPIError
 from contextlib import contextmanager
 from loguru import logger
 from pathlib import Path
 import os
+import random
+import threading
 import time
 
 from .models import Base
 
 
+# PRAGMAs de rendimiento para SQLite en archivo. WAL + synchronous=NORMAL es
+# la combinación recomendada: sin fsync en cada commit, solo en los checkpoints
+PRAGMAS_SQLITE_ARCHIVO = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",  # 64 MB (negativo = KiB)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB de lecturas mapeadas en memoria
+    "PRAGMA wal_autocheckpoint=1000"
+)
+
+# Consulta de verificación de conexión (se arma una sola vez)
+CONSULTA_PING = text("SELECT 1")
+
+# Segundos que se reutiliza el resultado de obtener_estadisticas
+TTL_ESTADISTICAS = 15
+
+# Cada cuánto se hace checkpoint del WAL + PRAGMA optimize (segundos)
+INTERVALO_MANTENIMIENTO = 15 * 60
+
+# Entradas del caché de sentencias compiladas de SQLAlchemy. Cada forma
+# de consulta (combinación de filtros, columnas, ORDER BY) ocupa una entrada
+TAMANO_CACHE_CONSULTAS = 1200
+
+# Índices de una sola columna reemplazados por los compuestos del modelo
+# (cada uno es prefijo de alguno); se borran de las bases ya creadas
+INDICES_OBSOLETOS = (
+    "ix_transacciones_tipo",
+    "ix_transacciones_persona",
+    "ix_transacciones_fecha_transaccion",
+)
+
+
 class Database:
     """Gestor de base de datos SQLAlchemy"""
 
@@ -31,6 +66,8 @@ class Database:
         self.database_url = database_url
         self.engine = None
         self.SessionLocal = None
+        self._timer_mantenimiento = None
+        self._cache_estadisticas = None  # (vencimiento, estadísticas)
 
         self._crear_engine()
 
@@ -43,56 +80,159 @@ class Database:
                 self.engine = create_engine(
                     self.database_url,
                     echo=False,
+                    query_cache_size=TAMANO_CACHE_CONSULTAS,
                     connect_args={"check_same_thread": False},
                     poolclass=StaticPool
                 )
 
-                # Habilitar foreign keys en SQLite
+                # Habilitar foreign keys. WAL (Write-Ahead Logging para mejor
+                # rendimiento), cache, mmap y fsync solo tienen sentido con
+                # archivo en disco: en memoria SQLite ignora el WAL igual
+                pragmas = ["PRAGMA foreign_keys=ON"]
+                if not self._es_sqlite_en_memoria():
+                    pragmas.append("PRAGMA journal_mode=WAL")
+                    pragmas.extend(PRAGMAS_SQLITE_ARCHIVO)
+
+                # Un solo script por conexión nueva, armado una vez
+                script_pragmas = ";\n".join(pragmas) + ";"
+
                 @event.listens_for(self.engine, "connect")
                 def set_sqlite_pragma(dbapi_conn, connection_record):
                     cursor = dbapi_conn.cursor()
-                    cursor.execute("PRAGMA foreign_keys=ON")
-                    cursor.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging para mejor rendimiento
+                    cursor.executescript(script_pragmas)
                     cursor.close()
 
             else:
-                # PostgreSQL u otras bases
+                # PostgreSQL u otras bases. LIFO reutiliza la conexión más
+                # reciente (cachés del backend calientes) y deja que las
+                # sobrantes queden ociosas y se cierren antes
+                pool_use_lifo = os.getenv("DB_POOL_USE_LIFO", "true").lower() in ("1", "true", "yes", "si")
+                pool_reset = os.getenv("DB_POOL_RESET", "rollback").lower()
+
+                # psycopg2: INSERT con VALUES múltiples por página y
+                # execute_batch para UPDATE/DELETE executemany (opciones
+                # propias del driver: otros dialectos las rechazan)
+                opciones_driver = {}
+                if make_url(self.database_url).get_driver_name() == "psycopg2":
+                    opciones_driver = {
+                        "executemany_mode": "values_plus_batch",
+                        "insertmanyvalues_page_size": 1000,
+                        "executemany_batch_page_size": 500
+                    }
+
                 self.engine = create_engine(
                     self.database_url,
                     echo=False,
+                    query_cache_size=TAMANO_CACHE_CONSULTAS,
                     pool_size=10,
                     max_overflow=20,
                     pool_pre_ping=True,  # Verificar conexiones antes de usar
                     pool_recycle=3600,  # Reciclar conexiones cada hora
                     pool_timeout=30,  # Timeout de 30s al obtener conexión del pool
+                    pool_use_lifo=pool_use_lifo,
+                    pool_reset_on_return=None if pool_reset == "none" else pool_reset,  # rollback / commit / none
                     connect_args={
                         "connect_timeout": 10,  # Timeout de conexión de 10s
                         "options": "-c statement_timeout=30000"  # Timeout de statement 30s
-                    }
+                    },
+                    **opciones_driver
                 )
 
-            # Crear SessionLocal
-            self.SessionLocal = scoped_session(
-                sessionmaker(
-                    autocommit=False,
-                    autoflush=False,
-                    bind=self.engine
-                )
+            # Cualquier escritura invalida las estadísticas cacheadas
+            @event.listens_for(self.engine, "after_cursor_execute")
+            def invalidar_estadisticas(conn, cursor, statement, parameters, context, executemany):
+                if context.isinsert or context.isupdate or context.isdelete:
+                    self._cache_estadisticas = None
+
+            # Crear SessionLocal. Cada get_session abre y cierra su propia
+            # sesión (sin registro por hilo). Sin autoflush (las lecturas no
+            # disparan un flush previo) ni expire_on_commit: los objetos leídos
+            # siguen usables tras el commit sin volver a consultarlos
+            self.SessionLocal = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                bind=self.engine
             )
 
-            logger.info(f"✅ Engine de base de datos creado: {self.database_url}")
+            logger.info("✅ Engine de base de datos creado: {}", self.database_url)
+
+            if self.database_url.startswith("sqlite") and not self._es_sqlite_en_memoria():
+                self._programar_mantenimiento()
 
         except Exception as e:
-            logger.error(f"❌ Error al crear engine de BD: {e}")
+            logger.error("❌ Error al crear engine de BD: {}", e)
             raise
 
+    def _programar_mantenimiento(self):
+        """Agenda _mantenimiento cada INTERVALO_MANTENIMIENTO en un hilo daemon"""
+        def ejecutar():
+            self._mantenimiento()
+            # cerrar() deja el timer en None: no se vuelve a agendar
+            if self._timer_mantenimiento is not None:
+                self._programar_mantenimiento()
+
+        self._timer_mantenimiento = threading.Timer(INTERVALO_MANTENIMIENTO, ejecutar)
+        self._timer_mantenimiento.daemon = True
+        self._timer_mantenimiento.start()
+
+    def _mantenimiento(self):
+        """
+        Checkpoint del WAL y PRAGMA optimize (solo SQLite en archivo)
+
+        Vacía el WAL para que no crezca hasta el auto-checkpoint (que frena el
+        COMMIT que lo dispara) y actualiza las estadísticas del planificador.
+        """
+        if not self.database_url.startswith("sqlite") or self._es_sqlite_en_memoria():
+            return
+
+        try:
+            import sqlite3
+
+            # Conexión propia: la del StaticPool se comparte con la app y al
+            # devolverla al pool se haría rollback de lo que esté en curso
+            conexion = sqlite3.connect(self.engine.url.database, timeout=5)
+            try:
+                conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                # 0x10002: revisar todas las tablas, no solo las usadas por
+                # esta conexión recién abierta (SQLite 3.46+; las versiones
+                # anteriores usan la máscara por defecto). analysis_limit
+                # acota el costo del ANALYZE
+                conexion.execute("PRAGMA analysis_limit=400")
+                conexion.execute("PRAGMA optimize=0x10002")
+            finally:
+                conexion.close()
+
+            logger.debug("🧹 Mantenimiento de SQLite completado (checkpoint + optimize)")
+
+        except Exception as e:
+            logger.warning("⚠️ Error en mantenimiento de SQLite: {}", e)
+
+    def _es_sqlite_en_memoria(self) -> bool:
+        """Indica si la URL apunta a una base SQLite en memoria"""
+        return (
+            ":memory:" in self.database_url
+            or "mode=memory" in self.database_url
+            or self.database_url.rstrip("/") == "sqlite:"
+        )
+
     def crear_tablas(self):
         """Crea todas las tablas en la base de datos"""
         try:
             Base.metadata.create_all(bind=self.engine)
+
+            # create_all no agrega índices nuevos a tablas que ya existen
+            for tabla in Base.metadata.sorted_tables:
+                for indice in tabla.indexes:
+                    indice.create(bind=self.engine, checkfirst=True)
+
+            with self.engine.begin() as conn:
+                for indice in INDICES_OBSOLETOS:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {indice}"))
+
             logger.info("✅ Tablas de base de datos creadas/verificadas")
         except Exception as e:
-            logger.error(f"❌ Error al crear tablas: {e}")
+            logger.error("❌ Error al crear tablas: {}", e)
             raise
 
     def drop_tablas(self):
@@ -101,7 +241,7 @@ class Database:
             Base.metadata.drop_all(bind=self.engine)
             logger.warning("⚠️  Todas las tablas fueron eliminadas")
         except Exception as e:
-            logger.error(f"❌ Error al eliminar tablas: {e}")
+            logger.error("❌ Error al eliminar tablas: {}", e)
             raise
 
     @contextmanager
@@ -109,10 +249,12 @@ class Database:
         """
         Context manager para obtener una sesión de base de datos
 
+        Hace commit al salir del bloque o rollback si se lanza una excepción.
+        Los llamadores pueden además hacer commit()/rollback() explícitos.
+
         Uso:
             with db.get_session() as session:
                 session.add(objeto)
-                session.commit()
         """
         session = self.SessionLocal()
         try:
@@ -120,7 +262,7 @@ class Database:
             session.commit()
         except Exception as e:
             session.rollback()
-            logger.error(f"❌ Error en transacción de BD: {type(e).__name__}: {e}")
+            logger.error("❌ Error en transacción de BD: {}: {}", type(e).__name__, e)
             raise
         finally:
             session.close()
@@ -137,11 +279,15 @@ class Database:
     def cerrar(self):
         """Cierra todas las conexiones"""
         try:
-            self.SessionLocal.remove()
+            if self._timer_mantenimiento is not None:
+                self._timer_mantenimiento.cancel()
+                self._timer_mantenimiento = None
+            self._mantenimiento()
+
             self.engine.dispose()
             logger.info("✅ Conexiones de base de datos cerradas")
         except Exception as e:
-            logger.error(f"Error al cerrar BD: {e}")
+            logger.error("Error al cerrar BD: {}", e)
 
     def verificar_conexion(self, max_reintentos: int = 3, timeout: int = 5) -> bool:
         """
@@ -157,25 +303,28 @@ class Database:
         for intento in range(1, max_reintentos + 1):
             try:
                 with self.engine.connect() as conn:
-                    # Usar text() para la consulta SQL
-                    result = conn.execute(text("SELECT 1"))
-                    result.close()
+                    conn.execute(CONSULTA_PING).scalar()
 
                 logger.info("✅ Conexión a base de datos verificada")
                 return True
 
             except (OperationalError, DBAPIError) as e:
-                logger.warning(f"⚠️ Error al verificar conexión BD (intento {intento}/{max_reintentos}): {e}")
+                logger.warning("⚠️ Error al verificar conexión BD (intento {}/{}): {}", intento, max_reintentos, e)
                 if intento < max_reintentos:
-                    wait_time = 2 ** intento
-                    logger.info(f"⏳ Esperando {wait_time}s antes de reintentar...")
+                    # Descartar las conexiones del pool: la próxima se abre de
+                    # cero en lugar de reutilizar un socket caído
+                    self.engine.dispose()
+
+                    # Backoff acotado a 2s con jitter (evita reintentos sincronizados)
+                    wait_time = min(0.5 * 2 ** intento, 2.0) + random.uniform(0, 0.25)
+                    logger.info("⏳ Esperando {:.1f}s antes de reintentar...", wait_time)
                     time.sleep(wait_time)
                 else:
-                    logger.error(f"❌ No se pudo verificar conexión a BD después de {max_reintentos} intentos")
+                    logger.error("❌ No se pudo verificar conexión a BD después de {} intentos", max_reintentos)
                     return False
 
             except Exception as e:
-                logger.error(f"❌ Error inesperado al verificar conexión a BD: {type(e).__name__}: {e}")
+                logger.error("❌ Error inesperado al verificar conexión a BD: {}: {}", type(e).__name__, e)
                 return False
 
         return False
@@ -184,27 +333,56 @@ class Database:
         """
         Obtiene estadísticas de la base de datos
 
+        El resultado se reutiliza durante TTL_ESTADISTICAS segundos o hasta
+        la próxima escritura en la base.
+
         Returns:
             Diccionario con estadísticas
         """
-        from .models import Transaccion
+        cache = self._cache_estadisticas
+        if cache is not None and cache[0] > time.monotonic():
+            return dict(cache[1])
+
+        from sqlalchemy import func, select
+        from .models import Transaccion, TipoTransaccion
+
+        with self.get_session() as session:
+            # Total y conteo por tipo en una sola consulta, COUNT(*) directo
+            # sobre la tabla (Query.count() lo envuelve en una subconsulta)
+            total_transacciones, total_ingresos, total_egresos = session.execute(
+                select(
+                    func.count(),
+                    func.count().filter(Transaccion.tipo == TipoTransaccion.INGRESO),
+                    func.count().filter(Transaccion.tipo == TipoTransaccion.EGRESO)
+                ).select_from(Transaccion)
+            ).one()
+
+        estadisticas = {
+            "total_transacciones": total_transacciones,
+            "total_ingresos": total_ingresos,
+            "total_egresos": total_egresos
+        }
+        self._cache_estadisticas = (time.monotonic() + TTL_ESTADISTICAS, estadisticas)
+
+        return dict(estadisticas)
+
+    def insertar_transacciones_bulk(self, lista_datos: list) -> int:
+        """
+        Inserta muchas transacciones en una sola sesión y transacción
+
+        Usa crear_transacciones_batch (inserción en bloque, sin el costo del
+        unit of work por objeto de session.add).
+
+        Args:
+            lista_datos: Lista de diccionarios con datos de transacciones
+
+        Returns:
+            Cantidad de transacciones creadas
+        """
+        from .crud import crear_transacciones_batch
 
         with self.get_session() as session:
-            total_transacciones = session.query(Transaccion).count()
-
-            # Contar por tipo
-            total_ingresos = session.query(Transaccion).filter(
-                Transaccion.tipo == "ingreso"
-            ).count()
-            total_egresos = session.query(Transaccion).filter(
-                Transaccion.tipo == "egreso"
-            ).count()
-
-            return {
-                "total_transacciones": total_transacciones,
-                "total_ingresos": total_ingresos,
-                "total_egresos": total_egresos
-            }
+            return crear_transacciones_batch(session, lista_datos)
 
     def backup(self, ruta_backup: str):
         """
@@ -218,19 +396,30 @@ class Database:
             return
 
         try:
-            import shutil
+            import sqlite3
 
             # Extraer ruta de la base de datos del URL
-            db_path = self.database_url.replace("sqlite:///", "")
-
-            if Path(db_path).exists():
-                shutil.copy2(db_path, ruta_backup)
-                logger.info(f"✅ Backup creado: {ruta_backup}")
+            db_path = self.engine.url.database
+
+            if db_path and Path(db_path).exists():
+                # API de backup de SQLite: copia consistente (incluye lo que
+                # todavía está en el WAL) por lotes de páginas, sin bloquear a
+                # los escritores durante toda la copia. Conexiones propias para
+                # no tocar la del StaticPool que usa la app
+                origen = sqlite3.connect(db_path)
+                destino = sqlite3.connect(ruta_backup)
+                try:
+                    origen.backup(destino, pages=1000)
+                finally:
+                    destino.close()
+                    origen.close()
+
+                logger.info("✅ Backup creado: {}", ruta_backup)
             else:
-                logger.warning(f"Base de datos no encontrada: {db_path}")
+                logger.warning("Base de datos no encontrada: {}", db_path)
 
         except Exception as e:
-            logger.error(f"❌ Error al crear backup: {e}")
+            logger.error("❌ Error al crear backup: {}", e)
 
 
 # Instancia global de base de datos
@@ -293,24 +482,32 @@ if __name__ == "__main__":
     for key, value in stats.items():
         print(f"   {key}: {value}")
 
-    # Crear una transacción de prueba
-    from .models import Transaccion, TipoTransaccion, OrigenArchivo
+    # Crear transacciones de prueba (en bloque)
+    from .models import TipoTransaccion, OrigenArchivo
     from datetime import datetime
 
-    with db.get_session() as session:
-        transaccion = Transaccion(
-            tipo=TipoTransaccion.EGRESO,
-            categoria="factura_servicios",
-            monto=15000.50,
-            fecha_transaccion=datetime.now(),
-            emisor_receptor="Edenor SA",
-            descripcion="Factura de luz",
-            origen=OrigenArchivo.PDF,
-            procesado_por_ia=True
-        )
-        session.add(transaccion)
-
-    print("\n✅ Transacción creada")
+    cantidad = db.insertar_transacciones_bulk([
+        {
+            "tipo": TipoTransaccion.EGRESO,
+            "categoria": "factura_servicios",
+            "monto": 15000.50,
+            "fecha_transaccion": datetime.now(),
+            "emisor_receptor": "Edenor SA",
+            "descripcion": "Factura de luz",
+            "origen": OrigenArchivo.PDF,
+            "procesado_por_ia": True
+        },
+        {
+            "tipo": TipoTransaccion.INGRESO,
+            "categoria": "sueldo",
+            "monto": 500000,
+            "fecha_transaccion": datetime.now(),
+            "descripcion": "Sueldo",
+            "origen": OrigenArchivo.CSV
+        }
+    ])
+
+    print(f"\n✅ {cantidad} transacciones creadas")
 
     # Ver estadísticas actualizadas
     print("\n📊 Estadísticas actualizadas:")
@@ -3,8 +3,9 @@ Operaciones CRUD para la base de datos
 Create, Read, Update, Delete
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
-from typing import List, Dict, Optional
+from sqlalchemy import func, and_, or_, desc, select, update, insert
+from sqlalchemy.engine import Row
+from typing import List, Dict, Optional, Iterator, Union
 from datetime import datetime, timedelta
 from loguru import logger
 
@@ -12,6 +13,29 @@ from .models import (
     Transaccion, TipoTransaccion, OrigenArchivo
 )
 
+# Filas por lote al recorrer transacciones con stream=True
+TAMANO_LOTE_STREAM = 200
+
+# Conversión de strings a Enums por diccionario (en los batch se hace por fila)
+_TIPOS_POR_VALOR = {tipo.value: tipo for tipo in TipoTransaccion}
+_ORIGENES_POR_VALOR = {origen.value: origen for origen in OrigenArchivo}
+
+
+def _tipo_desde_valor(valor: str) -> TipoTransaccion:
+    """Convierte un string a TipoTransaccion (ValueError si no es válido)"""
+    tipo = _TIPOS_POR_VALOR.get(valor)
+    if tipo is None:
+        raise ValueError(f"Tipo de transacción inválido: {valor}")
+    return tipo
+
+
+def _origen_desde_valor(valor: str) -> OrigenArchivo:
+    """Convierte un string a OrigenArchivo (ValueError si no es válido)"""
+    origen = _ORIGENES_POR_VALOR.get(valor)
+    if origen is None:
+        raise ValueError(f"Origen de archivo inválido: {valor}")
+    return origen
+
 
 # ========== TRANSACCIONES ==========
 
@@ -29,10 +53,10 @@ def crear_transaccion(session: Session, datos: Dict) -> Transaccion:
     try:
         # Convertir strings a Enums
         if isinstance(datos.get("tipo"), str):
-            datos["tipo"] = TipoTransaccion(datos["tipo"])
+            datos["tipo"] = _tipo_desde_valor(datos["tipo"])
 
         if isinstance(datos.get("origen"), str):
-            datos["origen"] = OrigenArchivo(datos["origen"])
+            datos["origen"] = _origen_desde_valor(datos["origen"])
 
         # Parsear fecha si es string
         if isinstance(datos.get("fecha_transaccion"), str):
@@ -59,6 +83,10 @@ def crear_transacciones_batch(session: Session, lista_datos: List[Dict]) -> int:
     """
     Crea múltiples transacciones en batch
 
+    Las filas se validan y normalizan una por una (las inválidas se saltean)
+    y se insertan todas juntas con un INSERT executemany, sin crear objetos
+    ORM por fila.
+
     Args:
         session: Sesión de SQLAlchemy
         lista_datos: Lista de diccionarios con datos
@@ -67,16 +95,17 @@ def crear_transacciones_batch(session: Session, lista_datos: List[Dict]) -> int:
         Cantidad de transacciones creadas
     """
     try:
-        transacciones = []
+        columnas = Transaccion.__mapper__.column_attrs.keys()
+        filas = []
 
         for datos in lista_datos:
             try:
                 # Convertir strings a Enums
                 if isinstance(datos.get("tipo"), str):
-                    datos["tipo"] = TipoTransaccion(datos["tipo"])
+                    datos["tipo"] = _tipo_desde_valor(datos["tipo"])
 
                 if isinstance(datos.get("origen"), str):
-                    datos["origen"] = OrigenArchivo(datos["origen"])
+                    datos["origen"] = _origen_desde_valor(datos["origen"])
 
                 # Parsear fecha
                 if isinstance(datos.get("fecha_transaccion"), str):
@@ -85,19 +114,23 @@ def crear_transacciones_batch(session: Session, lista_datos: List[Dict]) -> int:
                     datos["fecha_transaccion"] = datetime.fromisoformat(datos["fecha"])
                     datos.pop("fecha", None)
 
-                transaccion = Transaccion(**datos)
-                transacciones.append(transaccion)
+                # Mismo criterio que Transaccion(**datos): campos desconocidos invalidan la fila
+                invalidos = [campo for campo in datos if campo not in columnas]
+                if invalidos:
+                    raise TypeError(f"campos inválidos para Transaccion: {', '.join(invalidos)}")
+
+                filas.append(datos)
 
             except Exception as e:
                 logger.warning(f"Error al procesar transacción individual: {e}")
                 continue
 
-        # Insertar en batch
-        session.bulk_save_objects(transacciones)
-        session.flush()
+        # Insertar en batch (executemany)
+        if filas:
+            session.execute(insert(Transaccion), filas)
 
-        logger.info(f"✅ {len(transacciones)} transacciones creadas en batch")
-        return len(transacciones)
+        logger.info(f"✅ {len(filas)} transacciones creadas en batch")
+        return len(filas)
 
     except Exception as e:
         logger.error(f"❌ Error al crear batch de transacciones: {e}")
@@ -105,8 +138,32 @@ def crear_transacciones_batch(session: Session, lista_datos: List[Dict]) -> int:
 
 
 def obtener_transaccion(session: Session, transaccion_id: int) -> Optional[Transaccion]:
-    """Obtiene una transacción por ID"""
-    return session.query(Transaccion).filter(Transaccion.id == transaccion_id).first()
+    """Obtiene una transacción por ID (mira primero el identity map de la sesión)"""
+    return session.get(Transaccion, transaccion_id)
+
+
+def obtener_fila_transaccion(
+    session: Session,
+    columnas: List,
+    transaccion_id: int
+) -> Optional[Row]:
+    """
+    Obtiene las columnas pedidas de una transacción por ID
+
+    A diferencia de obtener_transaccion, la fila no queda ligada a la sesión
+    y se puede guardar (por ejemplo en st.session_state) después de cerrarla.
+
+    Args:
+        session: Sesión de SQLAlchemy
+        columnas: Columnas de Transaccion a seleccionar
+        transaccion_id: ID de la transacción
+
+    Returns:
+        Fila con las columnas pedidas o None si no existe
+    """
+    return session.execute(
+        select(*columnas).filter(Transaccion.id == transaccion_id)
+    ).first()
 
 
 def obtener_transacciones(
@@ -115,24 +172,191 @@ def obtener_transacciones(
     categoria: Optional[str] = None,
     fecha_desde: Optional[datetime] = None,
     fecha_hasta: Optional[datetime] = None,
-    limite: int = 100
-) -> List[Transaccion]:
+    limite: int = 100,
+    requiere_revision: Optional[bool] = None,
+    stream: bool = False
+) -> Union[List[Transaccion], Iterator[Transaccion]]:
     """
     Obtiene transacciones con filtros opcionales
 
+    Con stream=True devuelve un iterador que trae las filas en lotes de
+    TAMANO_LOTE_STREAM (server-side cursor donde el driver lo soporta), útil
+    para recorrer muchas filas (limite grande o None) con memoria constante.
+    El iterador debe consumirse antes de cerrar la sesión.
+
+    Args:
+        session: Sesión de SQLAlchemy
+        tipo: Filtrar por tipo (ingreso/egreso)
+        categoria: Filtrar por categoría
+        fecha_desde: Fecha inicio
+        fecha_hasta: Fecha fin
+        limite: Cantidad máxima de resultados
+        requiere_revision: Filtrar por estado de revisión (None = todas)
+        stream: Devolver un iterador por lotes en lugar de una lista
+
+    Returns:
+        Lista (o iterador, con stream=True) de transacciones
+    """
+    query = _filtrar_transacciones(
+        session.query(Transaccion), tipo, categoria, fecha_desde, fecha_hasta, requiere_revision
+    )
+    query = _ordenar_y_limitar(query, limite)
+
+    if stream:
+        return iter(query.yield_per(TAMANO_LOTE_STREAM))
+
+    return query.all()
+
+
+def obtener_filas_transacciones(
+    session: Session,
+    columnas: List,
+    tipo: Optional[str] = None,
+    categoria: Optional[str] = None,
+    fecha_desde: Optional[datetime] = None,
+    fecha_hasta: Optional[datetime] = None,
+    limite: int = 100,
+    offset: int = 0,
+    requiere_revision: Optional[bool] = None
+) -> List[Row]:
+    """
+    Igual que obtener_transacciones pero trae solo las columnas pedidas
+
+    Usa un select de Core: devuelve filas livianas (acceso por atributo,
+    ej. fila.monto) sin hidratar objetos ORM ni pasar por el identity map.
+
     Args:
         session: Sesión de SQLAlchemy
+        columnas: Columnas de Transaccion a seleccionar (ej: [Transaccion.id, Transaccion.monto])
         tipo: Filtrar por tipo (ingreso/egreso)
         categoria: Filtrar por categoría
         fecha_desde: Fecha inicio
         fecha_hasta: Fecha fin
         limite: Cantidad máxima de resultados
+        offset: Cantidad de filas a saltear (para paginar)
+        requiere_revision: Filtrar por estado de revisión (None = todas)
+
+    Returns:
+        Lista de filas con las columnas pedidas
+    """
+    stmt = _filtrar_transacciones(
+        select(*columnas), tipo, categoria, fecha_desde, fecha_hasta, requiere_revision
+    )
+    stmt = _ordenar_y_limitar(stmt, limite, offset)
+
+    return session.execute(stmt).all()
+
+
+def obtener_filas_transacciones_keyset(
+    session: Session,
+    columnas: List,
+    despues_de_id: Optional[int] = None,
+    limite: int = 100,
+    tipo: Optional[str] = None,
+    requiere_revision: Optional[bool] = None
+) -> List[Row]:
+    """
+    Página de transacciones por ID descendente con paginación keyset
+
+    En lugar de OFFSET (que recorre y descarta las filas anteriores) arranca
+    justo después del último ID de la página previa, así el costo de cada
+    página no crece con la cantidad de páginas recorridas.
+
+    Args:
+        session: Sesión de SQLAlchemy
+        columnas: Columnas de Transaccion a seleccionar
+        despues_de_id: Último ID de la página anterior (None = primera página)
+        limite: Cantidad máxima de filas
+        tipo: Filtrar por tipo (ingreso/egreso)
+        requiere_revision: Filtrar por estado de revisión (None = todas)
 
     Returns:
-        Lista de transacciones
+        Lista de filas con las columnas pedidas
+    """
+    stmt = _filtrar_transacciones(
+        select(*columnas), tipo, None, None, None, requiere_revision
+    )
+
+    if despues_de_id is not None:
+        stmt = stmt.filter(Transaccion.id < despues_de_id)
+
+    stmt = stmt.order_by(desc(Transaccion.id)).limit(limite)
+
+    return session.execute(stmt).all()
+
+
+def contar_transacciones(
+    session: Session,
+    tipo: Optional[str] = None,
+    categoria: Optional[str] = None,
+    fecha_desde: Optional[datetime] = None,
+    fecha_hasta: Optional[datetime] = None
+) -> Dict:
+    """
+    Cuenta las transacciones que cumplen los filtros, sin traerlas
+
+    Returns:
+        Diccionario con total, personas y categorías distintas, y la última
+        fecha de modificación del filtro (cambia con cada alta o edición)
+    """
+    stmt = _filtrar_transacciones(
+        select(
+            func.count(Transaccion.id),
+            func.count(func.distinct(func.coalesce(func.nullif(Transaccion.persona, ""), "General"))),
+            func.count(func.distinct(Transaccion.categoria)),
+            func.max(Transaccion.fecha_modificacion)
+        ),
+        tipo, categoria, fecha_desde, fecha_hasta
+    )
+
+    total, personas, categorias, ultima_modificacion = session.execute(stmt).one()
+
+    return {
+        "total": total,
+        "personas": personas,
+        "categorias": categorias,
+        "ultima_modificacion": ultima_modificacion
+    }
+
+
+def contar_estados_revision(
+    session: Session,
+    tipo: Optional[str] = None,
+    requiere_revision: Optional[bool] = None
+) -> Dict:
     """
-    query = session.query(Transaccion)
+    Cuenta las transacciones por estado de revisión en una sola consulta
 
+    Args:
+        session: Sesión de SQLAlchemy
+        tipo: Filtrar por tipo (ingreso/egreso)
+        requiere_revision: Filtrar por estado de revisión (None = todas)
+
+    Returns:
+        Diccionario con total, requieren_revision, editadas y procesadas_ia
+    """
+    stmt = _filtrar_transacciones(
+        select(
+            func.count(),
+            func.count().filter(Transaccion.requiere_revision),
+            func.count().filter(Transaccion.editado_manualmente),
+            func.count().filter(Transaccion.procesado_por_ia)
+        ).select_from(Transaccion),
+        tipo, None, None, None, requiere_revision
+    )
+
+    total, requieren_revision, editadas, procesadas_ia = session.execute(stmt).one()
+
+    return {
+        "total": total,
+        "requieren_revision": requieren_revision,
+        "editadas": editadas,
+        "procesadas_ia": procesadas_ia
+    }
+
+
+def _filtrar_transacciones(query, tipo, categoria, fecha_desde, fecha_hasta, requiere_revision=None):
+    """Aplica los filtros comunes a un Query o Select de transacciones"""
     # Aplicar filtros
     if tipo:
         query = query.filter(Transaccion.tipo == TipoTransaccion(tipo))
@@ -146,20 +370,34 @@ def obtener_transacciones(
     if fecha_hasta:
         query = query.filter(Transaccion.fecha_transaccion <= fecha_hasta)
 
-    # Ordenar por fecha descendente
-    query = query.order_by(desc(Transaccion.fecha_transaccion))
+    if requiere_revision is not None:
+        query = query.filter(Transaccion.requiere_revision == requiere_revision)
+
+    return query
+
+
+def _ordenar_y_limitar(query, limite, offset=0):
+    """Ordena por fecha descendente y aplica límite/offset"""
+    # Ordenar por fecha descendente (ID como desempate para paginar sin saltos)
+    query = query.order_by(desc(Transaccion.fecha_transaccion), desc(Transaccion.id))
 
     # Limitar resultados
     if limite:
         query = query.limit(limite)
 
-    return query.all()
+    if offset:
+        query = query.offset(offset)
+
+    return query
 
 
 def actualizar_transaccion(session: Session, transaccion_id: int, datos: Dict) -> bool:
     """
     Actualiza una transacción existente
 
+    Emite un único UPDATE ... WHERE id = :id, sin cargar antes la fila
+    (los objetos ya cargados en la sesión se sincronizan igual).
+
     Args:
         session: Sesión de SQLAlchemy
         transaccion_id: ID de la transacción
@@ -169,18 +407,23 @@ def actualizar_transaccion(session: Session, transaccion_id: int, datos: Dict) -
         True si se actualizó correctamente
     """
     try:
-        transaccion = obtener_transaccion(session, transaccion_id)
+        # Solo los campos que son columnas del modelo
+        columnas = Transaccion.__mapper__.column_attrs.keys()
+        valores = {campo: valor for campo, valor in datos.items() if campo in columnas}
 
-        if not transaccion:
+        if not valores:
+            return session.get(Transaccion, transaccion_id) is not None
+
+        resultado = session.execute(
+            update(Transaccion)
+            .where(Transaccion.id == transaccion_id)
+            .values(**valores)
+        )
+
+        if resultado.rowcount == 0:
             logger.warning(f"Transacción {transaccion_id} no encontrada")
             return False
 
-        # Actualizar campos
-        for campo, valor in datos.items():
-            if hasattr(transaccion, campo):
-                setattr(transaccion, campo, valor)
-
-        session.flush()
         logger.info(f"✓ Transacción {transaccion_id} actualizada")
         return True
 
@@ -267,41 +510,46 @@ def calcular_estadisticas_periodo(
         Diccionario con estadísticas
     """
     try:
-        # Obtener transacciones del período
-        transacciones = session.query(Transaccion).filter(
-            and_(
-                Transaccion.fecha_transaccion >= fecha_inicio,
-                Transaccion.fecha_transaccion <= fecha_fin
-            )
+        # La base agrupa por (tipo, categoría); Python solo reparte esas filas
+        filas = session.execute(
+            select(
+                Transaccion.tipo,
+                Transaccion.categoria,
+                func.sum(Transaccion.monto),
+                func.count(Transaccion.id)
+            ).where(
+                and_(
+                    Transaccion.fecha_transaccion >= fecha_inicio,
+                    Transaccion.fecha_transaccion <= fecha_fin
+                )
+            ).group_by(Transaccion.tipo, Transaccion.categoria)
         ).all()
 
-        # Calcular totales
-        ingresos = [t for t in transacciones if t.tipo == TipoTransaccion.INGRESO]
-        egresos = [t for t in transacciones if t.tipo == TipoTransaccion.EGRESO]
-
-        total_ingresos = sum(t.monto for t in ingresos)
-        total_egresos = sum(t.monto for t in egresos)
-
-        # Agrupar por categoría
+        # Calcular totales y agrupar por categoría
+        total_ingresos = total_egresos = 0
+        cantidad_ingresos = cantidad_egresos = 0
         categorias_ingresos = {}
-        for t in ingresos:
-            cat = t.categoria
-            categorias_ingresos[cat] = categorias_ingresos.get(cat, 0) + t.monto
-
         categorias_egresos = {}
-        for t in egresos:
-            cat = t.categoria
-            categorias_egresos[cat] = categorias_egresos.get(cat, 0) + t.monto
+
+        for tipo, cat, monto, cantidad in filas:
+            if tipo == TipoTransaccion.INGRESO:
+                total_ingresos += monto
+                cantidad_ingresos += cantidad
+                categorias_ingresos[cat] = monto
+            elif tipo == TipoTransaccion.EGRESO:
+                total_egresos += monto
+                cantidad_egresos += cantidad
+                categorias_egresos[cat] = monto
 
         return {
             "fecha_inicio": fecha_inicio.isoformat(),
             "fecha_fin": fecha_fin.isoformat(),
-            "total_transacciones": len(transacciones),
+            "total_transacciones": cantidad_ingresos + cantidad_egresos,
             "total_ingresos": round(total_ingresos, 2),
             "total_egresos": round(total_egresos, 2),
             "balance": round(total_ingresos - total_egresos, 2),
-            "cantidad_ingresos": len(ingresos),
-            "cantidad_egresos": len(egresos),
+            "cantidad_ingresos": cantidad_ingresos,
+            "cantidad_egresos": cantidad_egresos,
             "categorias_ingresos": {k: round(v, 2) for k, v in categorias_ingresos.items()},
             "categorias_egresos": {k: round(v, 2) for k, v in categorias_egresos.items()}
         }
@@ -1,5 +1,5 @@
 """Modelos de base de datos para FacturIA 2.0"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Enum, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import enum
@@ -17,12 +17,31 @@ class OrigenArchivo(enum.Enum):
 
 class Transaccion(Base):
     __tablename__ = "transacciones"
+    __table_args__ = (
+        # Filtros del dashboard: persona + rango de fechas, agrupando por tipo
+        Index("ix_transacciones_persona_fecha_tipo", "persona", "fecha_transaccion", "tipo"),
+        # Estadísticas por día/tipo/categoría: el GROUP BY se resuelve solo con el índice.
+        # Es además el único que sirve ORDER BY fecha DESC ... LIMIT (tabla del
+        # dashboard, obtener_transacciones) y los rangos de fecha sin filtro de
+        # tipo (contar_transacciones, agregados por período): sin él, orden
+        # completo de la tabla aun con skip-scan sobre el índice por tipo
+        Index("ix_transacciones_fecha_tipo_categoria_monto", "fecha_transaccion", "tipo", "categoria", "monto"),
+        # Listado de revisión: filtra por tipo/revisión y pagina por ID descendente
+        Index("ix_transacciones_tipo_revision_id", "tipo", "requiere_revision", "id"),
+        # Por tipo + rango de fechas agrupando por categoría (top categorías,
+        # listados por tipo): búsqueda por rango que además cubre SUM(monto).
+        # El de arriba no sirve acá: con tipo = ? sin rango de fechas
+        # (obtener_top_categorias) tendría que recorrerse entero
+        Index("ix_transacciones_tipo_fecha_categoria_monto", "tipo", "fecha_transaccion", "categoria", "monto"),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    persona = Column(String(100), nullable=True, index=True, default="General")
-    tipo = Column(Enum(TipoTransaccion), nullable=False, index=True)
+    persona = Column(String(100), nullable=True, default="General")
+    # tipo, persona y fecha_transaccion sin índice propio: cada una encabeza
+    # alguno de los compuestos de arriba, que ya lo cubre
+    tipo = Column(Enum(TipoTransaccion), nullable=False)
     categoria = Column(String(50), nullable=False, index=True)
     monto = Column(Float, nullable=False)
-    fecha_transaccion = Column(DateTime, nullable=True, index=True)
+    fecha_transaccion = Column(DateTime, nullable=True)
     emisor_receptor = Column(String(200), nullable=True)
     descripcion = Column(Text, nullable=True)
     numero_comprobante = Column(String(100), nullable=True)
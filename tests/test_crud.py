@@ -0,0 +1,186 @@
+"""Tests de las consultas CRUD de transacciones (SQLite en memoria)"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.connection import Database
+from src.database.models import Transaccion, TipoTransaccion, OrigenArchivo
+from src.database.crud import (
+    crear_transacciones_batch,
+    obtener_transacciones,
+    obtener_filas_transacciones,
+    obtener_filas_transacciones_keyset,
+    contar_estados_revision,
+)
+
+
+COLUMNAS = [Transaccion.id, Transaccion.fecha_transaccion, Transaccion.tipo]
+FECHA_BASE = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def db():
+    base = Database("sqlite://")
+    base.crear_tablas()
+    yield base
+    base.cerrar()
+
+
+@pytest.fixture
+def db_con_datos(db):
+    """
+    40 transacciones con fechas repetidas (empates de a 4), fechas nulas y
+    combinaciones de tipo y flags de revisión/edición/IA
+    """
+    with db.get_session() as session:
+        for i in range(40):
+            session.add(Transaccion(
+                tipo=TipoTransaccion.INGRESO if i % 3 == 0 else TipoTransaccion.EGRESO,
+                categoria="sueldo" if i % 3 == 0 else "supermercado",
+                monto=float(i + 1),
+                fecha_transaccion=None if i % 10 == 9 else FECHA_BASE + timedelta(days=i % 7 // 4 + i // 8),
+                origen=OrigenArchivo.CSV,
+                requiere_revision=i % 2 == 0,
+                editado_manualmente=i % 5 == 0,
+                procesado_por_ia=i % 4 == 0
+            ))
+    return db
+
+
+def recorrer_keyset(session, limite, **filtros):
+    """Recorre todas las páginas keyset hasta la última"""
+    filas, despues_de_id = [], None
+
+    while True:
+        pagina = obtener_filas_transacciones_keyset(
+            session, COLUMNAS, despues_de_id=despues_de_id, limite=limite, **filtros
+        )
+        filas.extend(pagina)
+
+        if len(pagina) < limite:
+            return filas
+
+        despues_de_id = pagina[-1].id
+
+
+def recorrer_offset(session, limite, **filtros):
+    """Recorre todas las páginas por LIMIT/OFFSET hasta la última"""
+    filas, offset = [], 0
+
+    while True:
+        pagina = obtener_filas_transacciones(session, COLUMNAS, limite=limite, offset=offset, **filtros)
+        filas.extend(pagina)
+
+        if len(pagina) < limite:
+            return filas
+
+        offset += limite
+
+
+@pytest.mark.parametrize("limite", [1, 3, 7, 40, 100])
+@pytest.mark.parametrize("filtros", [
+    {},
+    {"tipo": "egreso"},
+    {"requiere_revision": True},
+    {"tipo": "ingreso", "requiere_revision": False},
+])
+def test_keyset_hasta_el_final_igual_que_offset(db_con_datos, limite, filtros):
+    with db_con_datos.get_session() as session:
+        por_keyset = recorrer_keyset(session, limite, **filtros)
+        por_offset = recorrer_offset(session, limite, **filtros)
+
+    ids_keyset = [fila.id for fila in por_keyset]
+    ids_offset = [fila.id for fila in por_offset]
+
+    # Cada fila aparece exactamente una vez en los dos recorridos
+    assert len(ids_keyset) == len(set(ids_keyset))
+    assert len(ids_offset) == len(set(ids_offset))
+    assert sorted(por_keyset) == sorted(por_offset)
+
+    # Keyset: ID descendente
+    assert ids_keyset == sorted(ids_keyset, reverse=True)
+
+    # Offset: fecha descendente (nulos al final) con ID descendente como desempate
+    clave = [(fila.fecha_transaccion is not None, fila.fecha_transaccion or FECHA_BASE, fila.id) for fila in por_offset]
+    assert clave == sorted(clave, reverse=True)
+
+
+def test_offset_con_empates_de_fecha_no_saltea_ni_repite(db_con_datos):
+    with db_con_datos.get_session() as session:
+        todas = obtener_filas_transacciones(session, COLUMNAS, limite=None)
+        paginadas = recorrer_offset(session, 3)
+
+    fechas = [fila.fecha_transaccion for fila in todas if fila.fecha_transaccion]
+    assert len(fechas) > len(set(fechas))  # Hay empates en la muestra
+
+    assert paginadas == todas
+    assert len(todas) == 40
+
+
+def test_keyset_sin_resultados(db):
+    with db.get_session() as session:
+        assert obtener_filas_transacciones_keyset(session, COLUMNAS) == []
+
+
+def test_contar_estados_revision(db_con_datos):
+    with db_con_datos.get_session() as session:
+        todas = obtener_transacciones(session, limite=None)
+
+        assert contar_estados_revision(session) == {
+            "total": 40,
+            "requieren_revision": sum(t.requiere_revision for t in todas),
+            "editadas": sum(t.editado_manualmente for t in todas),
+            "procesadas_ia": sum(t.procesado_por_ia for t in todas),
+        }
+
+        egresos = [t for t in todas if t.tipo == TipoTransaccion.EGRESO and t.requiere_revision]
+        assert contar_estados_revision(session, tipo="egreso", requiere_revision=True) == {
+            "total": len(egresos),
+            "requieren_revision": len(egresos),
+            "editadas": sum(t.editado_manualmente for t in egresos),
+            "procesadas_ia": sum(t.procesado_por_ia for t in egresos),
+        }
+
+
+def test_obtener_transacciones_stream_igual_que_lista(db_con_datos):
+    with db_con_datos.get_session() as session:
+        lista = obtener_transacciones(session, limite=None)
+        stream = obtener_transacciones(session, limite=None, stream=True)
+
+        assert not isinstance(stream, list)
+        assert [t.id for t in stream] == [t.id for t in lista]
+
+        filtrada = obtener_transacciones(session, tipo="ingreso", limite=5)
+        assert [t.id for t in obtener_transacciones(session, tipo="ingreso", limite=5, stream=True)] == [
+            t.id for t in filtrada
+        ]
+
+
+def test_crear_transacciones_batch(db):
+    datos = [
+        {"tipo": "egreso", "categoria": "supermercado", "monto": 10.5, "origen": "csv",
+         "fecha_transaccion": "2025-03-01T10:00:00"},
+        {"tipo": "ingreso", "categoria": "sueldo", "monto": 1000.0, "origen": "pdf", "persona": "Ana"},
+        # Tipo inválido: se descarta sin cortar el lote
+        {"tipo": "otro", "categoria": "x", "monto": 1.0, "origen": "csv"},
+        # Campo desconocido: se descarta sin cortar el lote
+        {"tipo": "egreso", "categoria": "salud", "monto": 2.0, "origen": "csv", "no_existe": 1},
+    ]
+
+    with db.get_session() as session:
+        assert crear_transacciones_batch(session, datos) == 2
+
+    with db.get_session() as session:
+        creadas = sorted(obtener_transacciones(session, limite=None), key=lambda t: t.monto)
+
+    assert [(t.tipo, t.origen, t.monto) for t in creadas] == [
+        (TipoTransaccion.EGRESO, OrigenArchivo.CSV, 10.5),
+        (TipoTransaccion.INGRESO, OrigenArchivo.PDF, 1000.0),
+    ]
+    assert creadas[0].fecha_transaccion == datetime(2025, 3, 1, 10, 0)
+    assert creadas[1].persona == "Ana"
+
+
+def test_crear_transacciones_batch_vacio(db):
+    with db.get_session() as session:
+        assert crear_transacciones_batch(session, []) == 0
@@ -0,0 +1,90 @@
+"""Tests del transformador de transacciones CSV"""
+import copy
+from datetime import datetime
+
+import pytest
+
+from src.config import CATEGORIAS_INGRESOS, CATEGORIAS_EGRESOS
+from src.csv_processor.data_transformer import DataTransformer
+
+
+TRANSACCIONES_MUESTRA = [
+    # Categorización por palabras clave (descripción y emisor)
+    {"tipo": "egreso", "monto": 15000.50, "descripcion": "  Factura Edenor Octubre  ",
+     "emisor_receptor": "Edenor SA ", "fecha": "2024-10-15"},
+    {"tipo": "ingreso", "monto": 500000, "descripcion": "Sueldo Octubre",
+     "emisor_receptor": "Empresa XYZ", "fecha": "2024-10-01"},
+    {"tipo": "egreso", "monto": -35000, "descripcion": "Compras",
+     "emisor_receptor": "Carrefour", "fecha": datetime(2024, 10, 10)},
+    # Categoría válida: se conserva
+    {"tipo": "egreso", "categoria": "supermercado", "monto": 10, "descripcion": "sueldo"},
+    # Categoría inválida para el tipo: se recategoriza
+    {"tipo": "ingreso", "categoria": "supermercado", "monto": 1.5, "descripcion": "honorarios"},
+    # Sin coincidencias: categoría por defecto
+    {"tipo": "egreso", "monto": 99, "descripcion": "algo raro", "fecha": ""},
+    {"tipo": "ingreso", "monto": 7, "descripcion": None, "emisor_receptor": None},
+    # Palabra clave dentro de otra palabra: no coincide (word boundary)
+    {"tipo": "egreso", "monto": 5, "descripcion": "sueldos", "fecha": None},
+    # Monto cero o nulo: queda igual
+    {"tipo": "egreso", "monto": 0, "descripcion": "Luz"},
+    {"tipo": "egreso", "monto": None, "descripcion": "Gas natural"},
+    # Tipo inválido o faltante
+    {"tipo": "otro", "monto": 3, "descripcion": "x"},
+    {"monto": 4, "descripcion": "sin tipo", "archivo_origen": "a.csv"},
+    # Campos extra: se conservan con su tipo original
+    {"tipo": "egreso", "monto": "120.5", "descripcion": "Netflix", "numero_comprobante": 123,
+     "fecha_transaccion": datetime(2024, 1, 2, 3, 4)},
+]
+
+
+@pytest.fixture
+def transformer():
+    return DataTransformer(CATEGORIAS_INGRESOS, CATEGORIAS_EGRESOS)
+
+
+def transformar_fila_por_fila(transformer, transacciones):
+    """Resultado de referencia: limpiar y categorizar cada transacción"""
+    return [
+        transformer.categorizar_transaccion(transformer.limpiar_transaccion(t))
+        for t in transacciones
+    ]
+
+
+def test_transformar_batch_igual_a_fila_por_fila(transformer):
+    esperado = transformar_fila_por_fila(transformer, copy.deepcopy(TRANSACCIONES_MUESTRA))
+    resultado = transformer.transformar_batch(copy.deepcopy(TRANSACCIONES_MUESTRA))
+
+    assert resultado == esperado
+
+    for fila, fila_esperada in zip(resultado, esperado):
+        # Mismas claves (y en el mismo orden) y mismos tipos de valor
+        assert list(fila) == list(fila_esperada)
+        assert {k: type(v) for k, v in fila.items()} == {k: type(v) for k, v in fila_esperada.items()}
+
+
+def test_transformar_batch_categorias(transformer):
+    resultado = transformer.transformar_batch(copy.deepcopy(TRANSACCIONES_MUESTRA))
+
+    assert [t.get("categoria") for t in resultado] == [
+        t.get("categoria") for t in transformar_fila_por_fila(transformer, copy.deepcopy(TRANSACCIONES_MUESTRA))
+    ]
+    assert resultado[0]["categoria"] == "factura_servicios"
+    assert resultado[3]["categoria"] == "supermercado"
+    assert resultado[5]["categoria"] == "otro_egreso"
+    assert resultado[10]["categoria"] is None
+    assert "tipo" not in resultado[11]
+
+
+def test_transformar_batch_modifica_los_mismos_dicts(transformer):
+    transacciones = copy.deepcopy(TRANSACCIONES_MUESTRA)
+
+    resultado = transformer.transformar_batch(transacciones)
+
+    assert all(a is b for a, b in zip(resultado, transacciones))
+    assert resultado[2]["monto"] == 35000.0
+    assert isinstance(resultado[1]["monto"], float)
+    assert resultado[8]["monto"] == 0
+
+
+def test_transformar_batch_vacio(transformer):
+    assert transformer.transformar_batch([]) == []